@@ -1,76 +1,92 @@
 import configparser
 import json
-import skip_autofill
 from common import *
 from partkeepr_connector.partkeepr import Partkeepr
-import sys
+from partkeepr_connector.components import load_components
+from partkeepr_connector.skip_rules import SkipRules
+from partkeepr_connector import profiling
+from partkeepr_connector.third_party import add_partname_resolver_path
 
-sys.path.insert(1, "third_party/partname-resolver")
+add_partname_resolver_path()
 from partname_resolver.resistors import resistors_partname_decoder
 from partname_resolver.capacitors import capacitors_partname_decoder
 
 
 class AutofillDescription:
-    def __init__(self):
+    def __init__(self, config_filename="config.ini"):
         config = configparser.ConfigParser()
-        config.read("config.ini")
+        config.read(config_filename)
         self.partkeepr = Partkeepr(config)
-        self.partkeepr.get_components()  # this will create resistors.json and capacitors.json
-        with open("resistors.json") as file:
-            self.resistors = json.load(file)
-        with open("capacitors.json") as file:
-            self.capacitors = json.load(file)
+        self.partkeepr.get_components()  # this will sync snapshot and export resistors and capacitors
+        self.resistors = load_components(config, "resistors")
+        self.capacitors = load_components(config, "capacitors")
+        self.skip_rules = SkipRules.from_config(config, "autofill", "autofill_skip_file_location")
+        self.skip_description = self.skip_rules.get("skip_autofill", "autofill_description")
+
+    def close(self):
+        self.partkeepr.close()
+
+    def print_unused_skip_entries(self):
+        self.skip_rules.print_unused()
 
     def autofill_resistors_description(self):
-        for resistor in self.resistors:
-            if resistor['partkeepr_id'] in skip_autofill.autofill_description:
-                print("Skipping description update of part: ", resistor['partkeepr_id'], " found in skip list.")
-                continue
-            if len(resistor['manufacturers']):
-                manufacturer_part_number = resistor["manufacturers"][0]['partNumber']
-                resistor_from_partname = resistors_partname_decoder.resolve(manufacturer_part_number)
-            else:
-                resistor_from_partname = None
-            resistor_from_parameters = resistor_from_partkeepr_json(resistor)
-            if resistor_from_partname is not None:
-                if resistor_from_parameters.partial_compare(resistor_from_partname):
-                    if resistor["description"] != resistor_from_partname.get_description():
-                        self.partkeepr.edit_part_description(resistor["partkeepr_id"],
-                                                             resistor_from_partname.get_description())
+        with self.partkeepr.changes():
+            for resistor in self.resistors:
+                if resistor in self.skip_description:
+                    print("Skipping description update of part: ", resistor['partkeepr_id'], " found in skip list.")
+                    continue
+                if len(resistor['manufacturers']):
+                    manufacturer_part_number = resistor["manufacturers"][0]['partNumber']
+                    with profiling.stage('resolve', 'resistors'):
+                        resistor_from_partname = resolve_partname(resistors_partname_decoder, manufacturer_part_number)
                 else:
-                    print("Unable to update description, part parameters are different than parameters from part name")
-                    print("From part name:", resistor_from_partname)
-                    print("From parameters:", resistor_from_parameters)
-            else:
-                if resistor["description"] != resistor_from_parameters.get_description():
-                    self.partkeepr.edit_part_description(resistor["partkeepr_id"],
-                                                         resistor_from_parameters.get_description())
+                    resistor_from_partname = None
+                with profiling.stage('decode', 'resistors'):
+                    resistor_from_parameters = resistor_from_partkeepr_json(resistor)
+                with profiling.stage('compare', 'resistors'):
+                    if resistor_from_partname is not None:
+                        if resistor_from_parameters.partial_compare(resistor_from_partname):
+                            if resistor["description"] != resistor_from_partname.get_description():
+                                self.partkeepr.edit_part_description(resistor["partkeepr_id"],
+                                                                     resistor_from_partname.get_description())
+                        else:
+                            print("Unable to update description, part parameters are different than parameters from part name")
+                            print("From part name:", resistor_from_partname)
+                            print("From parameters:", resistor_from_parameters)
+                    else:
+                        if resistor["description"] != resistor_from_parameters.get_description():
+                            self.partkeepr.edit_part_description(resistor["partkeepr_id"],
+                                                                 resistor_from_parameters.get_description())
 
     def autofill_capacitors_description(self):
-        for capacitor in self.capacitors:
-            if capacitor['partkeepr_id'] in skip_autofill.autofill_description:
-                print("Skipping description update of part: ", capacitor['partkeepr_id'], " found in skip list.")
-                continue
-            if len(capacitor['manufacturers']):
-                manufacturer_part_number = capacitor["manufacturers"][0]['partNumber']
-                capacitor_from_partname = capacitors_partname_decoder.resolve(manufacturer_part_number)
-            else:
-                capacitor_from_partname = None
-            capacitor_from_parameters = capacitor_from_partkeepr_json(capacitor)
-            if capacitor_from_partname is not None:
-                if capacitor_from_parameters.partial_compare(capacitor_from_partname, debug=True):
-                    if capacitor["description"] != capacitor_from_partname.get_description():
-                        print("Updating description, from:", capacitor["description"], ", to:",
-                              capacitor_from_parameters.get_description())
-                        self.partkeepr.edit_part_description(capacitor["partkeepr_id"],
-                                                             capacitor_from_partname.get_description())
+        with self.partkeepr.changes():
+            for capacitor in self.capacitors:
+                if capacitor in self.skip_description:
+                    print("Skipping description update of part: ", capacitor['partkeepr_id'], " found in skip list.")
+                    continue
+                if len(capacitor['manufacturers']):
+                    manufacturer_part_number = capacitor["manufacturers"][0]['partNumber']
+                    with profiling.stage('resolve', 'capacitors'):
+                        capacitor_from_partname = resolve_partname(capacitors_partname_decoder, manufacturer_part_number)
                 else:
-                    print("Unable to update description, part parameters are different than parameters from part name")
-                    print("\tFrom part name:", capacitor_from_partname)
-                    print("\tFrom parameters:", capacitor_from_parameters)
-            else:
-                if capacitor["description"] != capacitor_from_parameters.get_description():
-                    print("Updating description, from:", capacitor["description"], ", to:",
-                          capacitor_from_parameters.get_description())
-                    self.partkeepr.edit_part_description(capacitor["partkeepr_id"],
-                                                         capacitor_from_parameters.get_description())
+                    capacitor_from_partname = None
+                with profiling.stage('decode', 'capacitors'):
+                    capacitor_from_parameters = capacitor_from_partkeepr_json(capacitor)
+                with profiling.stage('compare', 'capacitors'):
+                    if capacitor_from_partname is not None:
+                        if capacitor_from_parameters.partial_compare(capacitor_from_partname, debug=True):
+                            if capacitor["description"] != capacitor_from_partname.get_description():
+                                print("Updating description, from:", capacitor["description"], ", to:",
+                                      capacitor_from_parameters.get_description())
+                                self.partkeepr.edit_part_description(capacitor["partkeepr_id"],
+                                                                     capacitor_from_partname.get_description())
+                        else:
+                            print("Unable to update description, part parameters are different than parameters from part name")
+                            print("\tFrom part name:", capacitor_from_partname)
+                            print("\tFrom parameters:", capacitor_from_parameters)
+                    else:
+                        if capacitor["description"] != capacitor_from_parameters.get_description():
+                            print("Updating description, from:", capacitor["description"], ", to:",
+                                  capacitor_from_parameters.get_description())
+                            self.partkeepr.edit_part_description(capacitor["partkeepr_id"],
+                                                                 capacitor_from_parameters.get_description())
@@ -2,9 +2,13 @@ import configparser
 import json
 from partkeepr_connector.partkeepr import Partkeepr
 from partkeepr_connector.part_to_component import part_to_inductor
-import sys
+from partkeepr_connector.concurrency import ordered_map
+from partkeepr_connector.session import PartkeeprApiError
+from partkeepr_connector.partname_cache import resolve_partname
+from partkeepr_connector.third_party import add_partname_resolver_path
+from partkeepr_connector import profiling
 
-sys.path.insert(1, "third_party/partname-resolver")
+add_partname_resolver_path()
 from partname_resolver.inductors import inductors_partname_decoder
 
 
@@ -12,72 +16,115 @@ class AutoFillInductors:
     def __init__(self, config_filename="config.ini"):
         config = configparser.ConfigParser()
         config.read(config_filename)
+        self.config = config
         self.partkeepr = Partkeepr(config)
 
+    def close(self):
+        self.partkeepr.close()
+
     def add_missing_parameters(self, part, inductor):
-        if not part.has_parameter("Part Type") and inductor.type is not None:
+        if not part.has_parameter_named("Part Type") and inductor.type is not None:
             part.add_parameter("Part Type", inductor.type.value)
-        if not part.has_parameter('Inductance') and inductor.inductance is not None:
+        if not part.has_parameter_named('Inductance') and inductor.inductance is not None:
             part.add_parameter('Inductance', inductor.inductance)
-        if not part.has_parameter('Tolerance') and inductor.tolerance is not None:
+        if not part.has_parameter_named('Tolerance') and inductor.tolerance is not None:
             part.add_parameter('Tolerance', inductor.tolerance)
-        if not part.has_parameter('Working Temperature') and inductor.working_temperature_range is not None:
+        if not part.has_parameter_named('Working Temperature') and inductor.working_temperature_range is not None:
             part.add_parameter('Working Temperature', inductor.working_temperature_range)
-        if not part.has_parameter("Voltage") and inductor.max_working_voltage is not None:
+        if not part.has_parameter_named("Voltage") and inductor.max_working_voltage is not None:
             part.add_parameter("Voltage", inductor.max_working_voltage, numeric_value_field='maxVoltage')
-        if not part.has_parameter('Q') and inductor.q is not None:
+        if not part.has_parameter_named('Q') and inductor.q is not None:
             part.add_parameter('Q', inductor.q)
-        if not part.has_parameter('Resistance') and inductor.dc_resistance:
+        if not part.has_parameter_named('Resistance') and inductor.dc_resistance:
             part.add_parameter("Resistance", inductor.resistance)
-        if not part.has_parameter('Rated Current') and inductor.rated_current:
+        if not part.has_parameter_named('Rated Current') and inductor.rated_current:
             part.add_parameter('Rated Current', inductor.rated_current)
-        if not part.has_parameter("Self Resonant Frequency") and inductor.self_resonant_frequency:
+        if not part.has_parameter_named("Self Resonant Frequency") and inductor.self_resonant_frequency:
             part.add_parameter('Self Resonant Frequency', inductor.self_resonant_frequency)
         return part
 
-    def update_description(self, part, description):
+    def update_description(self, part, description, report):
         if description is not None:
-            print('\tNew description:', description)
+            report.append(('\tNew description:', description))
             part.set_description(description)
         return part
 
-    def update_comment(self, part, comment):
+    def update_comment(self, part, comment, report):
         if comment is not None and len(comment) > 0:
-            print('\tNew comment:', comment)
+            report.append(('\tNew comment:', comment))
             part.set_comment(comment)
         return part
 
-    def run(self, part_list, dry_run=False):
-        for part_id in part_list:
+    def autofill_part(self, part_id, dry_run=False):
+        """Fetch part, fill it with parameters decoded from manufacturer part number and send it back to Partkeepr.
+
+        Nothing is printed here, so parts can be processed concurrently, lines to print are returned instead.
+        """
+        report = []
+        with profiling.stage('fetch', 'inductors'):
             part = self.partkeepr.get_part(part_id)
+        with profiling.stage('decode', 'inductors'):
             inductor_form_parameters = part_to_inductor(part)
-            if len(part.get_manufacturers()) != 1:
-                print("Unable to update parameters of:", part.get_name(), "(" + part.get_id() + "),", "reason: incorrect manufacturers count")
-                print("\tUpdating description only")
-                part = self.update_description(part, inductor_form_parameters.get_description())
-            else:
-                inductor = inductors_partname_decoder.resolve(part.get_manufacturers()[0]['partNumber'])
-                if inductor is not None:
-                    print("Updating:", part.get_name(), "(" + part.get_id() + "),")
-                    inductor.merge(inductor_form_parameters)
-                    part = self.add_missing_parameters(part, inductor)
-                    part = self.update_description(part, inductor.get_description())
-                    part = self.update_comment(part, inductor.note)
-                else:
-                    print("Unable to update parameters of:", part.get_name(), "(" + part.get_id() + "),",
-                          "reason: unable to decode manufacturer part number")
-                    print("\tUpdating description only")
-                    part = self.update_description(part, inductor_form_parameters.get_description())
-            if dry_run:
-                print(json.dumps(part.request, indent=4, sort_keys=True))
+        if len(part.get_manufacturers()) != 1:
+            report.append(("Unable to update parameters of:", part.get_name(), "(" + part.get_id() + "),",
+                           "reason: incorrect manufacturers count"))
+            report.append(("\tUpdating description only",))
+            part = self.update_description(part, inductor_form_parameters.get_description(), report)
+        else:
+            with profiling.stage('resolve', 'inductors'):
+                inductor = resolve_partname(inductors_partname_decoder, part.get_manufacturers()[0]['partNumber'])
+            if inductor is not None:
+                report.append(("Updating:", part.get_name(), "(" + part.get_id() + "),"))
+                inductor.merge(inductor_form_parameters)
+                part = self.add_missing_parameters(part, inductor)
+                part = self.update_description(part, inductor.get_description(), report)
+                part = self.update_comment(part, inductor.note, report)
             else:
-                self.partkeepr.update_part(part)
-
-
-
-
-
-
-
-
-
+                report.append(("Unable to update parameters of:", part.get_name(), "(" + part.get_id() + "),",
+                               "reason: unable to decode manufacturer part number"))
+                report.append(("\tUpdating description only",))
+                part = self.update_description(part, inductor_form_parameters.get_description(), report)
+        if dry_run:
+            report.append((json.dumps(part.request, indent=4, sort_keys=True),))
+        else:
+            report.append(("Updating part:", part.get_id()))
+            with profiling.stage('write', 'inductors'):
+                self.partkeepr.update_part(part, verbose=False)
+        return report
+
+    def __autofill_part_isolated(self, part_id, dry_run):
+        try:
+            with profiling.part(part_id, 'inductors'):
+                return self.autofill_part(part_id, dry_run), None
+        except PartkeeprApiError as error:
+            return [("Unable to update part:", part_id + ",", "reason:", error)], error
+
+    def run(self, part_list, dry_run=False, workers=None, max_in_flight=None):
+        """Autofill parts from part_list, output is printed in part_list order whatever the number of workers is.
+        A part which fails on API error doesn't stop the run, ids of failed parts are reported at the end and returned.
+
+        :workers: number of parts processed concurrently, [autofill] workers config value is used when None
+        :max_in_flight: limit of parts fetched but not yet reported, defaults to twice the number of workers
+        """
+        # part ids are iterated by the workers and again to report them, a generator would be used up by the first
+        part_list = list(part_list)
+        if workers is None:
+            workers = self.config.getint("autofill", "workers", fallback=1)
+        if workers > 1 and profiling.enabled and profiling.slowest_parts > 0:
+            # cProfile profiles one part at a time, concurrent parts would be left out or mixed into the profile
+            print("Profiling slowest parts, processing parts one by one instead of by", workers, "workers")
+            workers = 1
+        if workers > 1:
+            results = ordered_map(lambda part_id: self.__autofill_part_isolated(part_id, dry_run), part_list,
+                                  workers=workers, max_in_flight=max_in_flight)
+        else:
+            results = (self.__autofill_part_isolated(part_id, dry_run) for part_id in part_list)
+        failed = []
+        for part_id, (report, error) in zip(part_list, results):
+            for line in report:
+                print(*line)
+            if error is not None:
+                failed.append(part_id)
+        if len(failed) > 0:
+            print("Failed to update", len(failed), "parts:", ", ".join(failed))
+        return failed
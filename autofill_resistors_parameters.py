@@ -3,22 +3,28 @@ class AutofillDescription:
         config = configparser.ConfigParser()
         config.read("config.ini")
         self.partkeepr = Partkeepr(config)
-        self.partkeepr.get_components()  # this will create resistors.json and capacitors.json
-        with open("resistors.json") as file:
-            self.resistors = json.load(file)
-        with open("capacitors.json") as file:
-            self.capacitors = json.load(file)
+        self.partkeepr.get_components()  # this will sync snapshot and export resistors and capacitors
+        self.resistors = load_components(config, "resistors")
+        self.capacitors = load_components(config, "capacitors")
+        self.skip_rules = SkipRules.from_config(config, "autofill", "autofill_skip_file_location")
+        self.skip_description = self.skip_rules.get("skip_autofill", "autofill_description")
+
+    def close(self):
+        self.partkeepr.close()
+
+    def print_unused_skip_entries(self):
+        self.skip_rules.print_unused()
 
     def autofill_resistor_parameters(self, part, resistor):
-        if not part.has_parameter('Resistance') and resistor.resistance is not None:
+        if not part.has_parameter_named('Resistance') and resistor.resistance is not None:
             part.add_parameter('Resistance', resistor.resistance)
-        if not part.has_parameter('Tolerance') and resistor.tolerance is not None:
+        if not part.has_parameter_named('Tolerance') and resistor.tolerance is not None:
             part.add_parameter('Tolerance', resistor.tolerance)
-        if not part.has_parameter('Working Temperature') and resistor.working_temperature_range is not None:
+        if not part.has_parameter_named('Working Temperature') and resistor.working_temperature_range is not None:
             part.add_parameter('Working Temperature', resistor.working_temperature_range)
-        if not part.has_parameter("Voltage") and resistor.max_working_voltage is not None:
+        if not part.has_parameter_named("Voltage") and resistor.max_working_voltage is not None:
             part.add_parameter("Voltage", resistor.max_working_voltage, numeric_value_field='maxVoltage')
-        if not part.has_parameter('Power') and resistor.power is not None:
+        if not part.has_parameter_named('Power') and resistor.power is not None:
             part.add_parameter('Power', resistor.power)
         return part
 
@@ -33,12 +39,12 @@ class AutofillDescription:
 
     def add_parameters(self):
         for resistor in self.resistors:
-            if resistor['partkeepr_id'] in skip_autofill.autofill_description:
+            if resistor in self.skip_description:
                 print("Skipping description update of part: ", resistor['partkeepr_id'], " found in skip list.")
                 continue
             if len(resistor['manufacturers']):
                 manufacturer_part_number = resistor["manufacturers"][0]['partNumber']
-                resistor_from_partname = resistors_partname_decoder.resolve(manufacturer_part_number)
+                resistor_from_partname = resolve_partname(resistors_partname_decoder, manufacturer_part_number)
                 if resistor_from_partname is not None:
                     if 'Working Temperature' not in resistor['parameters'] and \
                             resistor_from_partname.working_temperature_range is not None:
@@ -50,19 +56,20 @@ class AutofillDescription:
                         self.partkeepr.update_part(part)
 
     def edit_power_parameter(self):
-        for resistor in self.resistors:
-            if resistor['partkeepr_id'] in skip_autofill.autofill_description:
-                print("Skipping parameter update of part: ", resistor['partkeepr_id'], " found in skip list.")
-                continue
-            if len(resistor['manufacturers']):
-                manufacturer_part_number = resistor["manufacturers"][0]['partNumber']
-                resistor_from_partname = resistors_partname_decoder.resolve(manufacturer_part_number)
-                if resistor_from_partname is not None:
-                    resistor_from_parameters = resistor_from_partkeepr_json(resistor)
-                    if resistor_from_partname.power != resistor_from_parameters.power:
-                        print("Updating power parameter at: ", resistor['partkeepr_id'], "from: ",
-                              resistor_from_parameters.power, " to: ", resistor_from_partname.power)
-                        new_value = {'value': None,
-                                     'minValue': None,
-                                     'maxValue': resistor_from_partname.power}
-                        self.partkeepr.edit_part_parameter(resistor['partkeepr_id'], "Power", new_value)
+        with self.partkeepr.changes():
+            for resistor in self.resistors:
+                if resistor in self.skip_description:
+                    print("Skipping parameter update of part: ", resistor['partkeepr_id'], " found in skip list.")
+                    continue
+                if len(resistor['manufacturers']):
+                    manufacturer_part_number = resistor["manufacturers"][0]['partNumber']
+                    resistor_from_partname = resolve_partname(resistors_partname_decoder, manufacturer_part_number)
+                    if resistor_from_partname is not None:
+                        resistor_from_parameters = resistor_from_partkeepr_json(resistor)
+                        if resistor_from_partname.power != resistor_from_parameters.power:
+                            print("Updating power parameter at: ", resistor['partkeepr_id'], "from: ",
+                                  resistor_from_parameters.power, " to: ", resistor_from_partname.power)
+                            new_value = {'value': None,
+                                         'minValue': None,
+                                         'maxValue': resistor_from_partname.power}
+                            self.partkeepr.edit_part_parameter(resistor['partkeepr_id'], "Power", new_value)
@@ -0,0 +1,148 @@
+"""Load benchmark of partkeepr_connector against the local fake Partkeepr server.
+
+For every inventory size a fake server is started and each scenario (get_components, get_part, update_part) is run
+in a fresh client process, so its peak RSS isn't polluted by previous scenarios or by the server. Reported are
+requests per second, p50/p99 latency of single API calls and peak RSS of the client.
+
+Usage: python -m benchmarks.connector_benchmark --sizes 1000 10000 100000 --output connector_benchmark.json
+"""
+import argparse
+import configparser
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+SCENARIOS = ['get_components', 'get_part', 'update_part']
+
+
+def percentile(values, fraction):
+    if len(values) == 0:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def client_config(url, page_size):
+    config = configparser.ConfigParser()
+    config.read_dict({"partkeepr": {"url": url, "user": "benchmark", "pwd": "benchmark", "page_size": str(page_size),
+                                    "units_cache": ""},
+                      "partkeepr component location": {"resistors": '"Root Category ➤ Resistors"',
+                                                       "capacitors": '"Root Category ➤ Capacitors"',
+                                                       "inductors": '"Root Category ➤ Inductors"'},
+                      "snapshot": {"location": ""}})
+    return config
+
+
+def run_client(url, scenario, part_count, calls, page_size):
+    """Runs single scenario in this process, returns its measurements"""
+    from partkeepr_connector.partkeepr import Partkeepr
+
+    latencies = []
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        with Partkeepr(client_config(url, page_size)) as partkeepr:
+            request = partkeepr.session.request
+
+            def timed_request(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return request(*args, **kwargs)
+                finally:
+                    latencies.append(time.perf_counter() - start)
+
+            partkeepr.session.request = timed_request
+            partkeepr.get_units()
+            del latencies[:]
+            part_ids = [str(random.Random(i).randint(1, part_count)) for i in range(calls)]
+            start = time.perf_counter()
+            if scenario == 'get_components':
+                partkeepr.get_components()
+            elif scenario == 'get_part':
+                for part_id in part_ids:
+                    partkeepr.get_part(part_id)
+            elif scenario == 'update_part':
+                parts = [partkeepr.get_part(part_id) for part_id in part_ids]
+                del latencies[:]
+                start = time.perf_counter()
+                for part in parts:
+                    partkeepr.update_part(part, verbose=False)
+            elapsed = time.perf_counter() - start
+    return {'scenario': scenario,
+            'parts': part_count,
+            'requests': len(latencies),
+            'seconds': elapsed,
+            'requests_per_second': len(latencies) / elapsed if elapsed > 0 else None,
+            'latency_p50': percentile(latencies, 0.5),
+            'latency_p99': percentile(latencies, 0.99),
+            'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+
+
+def start_server(part_count, latency, error_rate):
+    server = subprocess.Popen([sys.executable, '-m', 'benchmarks.fake_partkeepr', '--parts', str(part_count),
+                               '--latency', str(latency), '--error-rate', str(error_rate)],
+                              stdout=subprocess.PIPE, universal_newlines=True, cwd=repository_root())
+    return server, server.stdout.readline().strip()
+
+
+def repository_root():
+    return os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+def run(sizes, calls, page_size, latency, error_rate):
+    results = []
+    for part_count in sizes:
+        server, url = start_server(part_count, latency, error_rate)
+        try:
+            for scenario in SCENARIOS:
+                output = subprocess.check_output([sys.executable, '-m', 'benchmarks.connector_benchmark', '--client',
+                                                  url, '--scenario', scenario, '--sizes', str(part_count),
+                                                  '--calls', str(calls), '--page-size', str(page_size)],
+                                                 universal_newlines=True, cwd=repository_root())
+                result = json.loads(output.splitlines()[-1])
+                results.append(result)
+                print(format_result(result))
+        finally:
+            server.terminate()
+            server.wait()
+    return results
+
+
+def format_result(result):
+    def ms(value):
+        return "{:8.2f}ms".format(value * 1000) if value is not None else "       n/a"
+
+    return "{:>15} {:>7} parts: {:8.1f} req/s, p50 {}, p99 {}, peak RSS {:8.1f} MB".format(
+        result['scenario'], result['parts'], result['requests_per_second'] or 0, ms(result['latency_p50']),
+        ms(result['latency_p99']), result['peak_rss_kb'] / 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partkeepr connector load benchmark using local fake server")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help="inventory sizes")
+    parser.add_argument('--calls', type=int, default=200, help="number of get_part and update_part calls")
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.0, help="fake server response delay in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of fake server 503 responses")
+    parser.add_argument('--output', help="save results into JSON file")
+    parser.add_argument('--client', metavar='URL', help=argparse.SUPPRESS)
+    parser.add_argument('--scenario', choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.client is not None:
+        sys.path.insert(0, repository_root())
+        print(json.dumps(run_client(args.client, args.scenario, args.sizes[0], args.calls, args.page_size)))
+        return
+
+    results = run(args.sizes, args.calls, args.page_size, args.latency, args.error_rate)
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
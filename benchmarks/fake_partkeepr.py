@@ -0,0 +1,216 @@
+"""Local stand-in of Partkeepr API, serving a synthetic inventory.
+
+Implements the endpoints used by partkeepr_connector: /api/parts (with hydra paging), /api/parts/{id} (GET and
+PUT), /api/units, /api/parts/getPartParameterNames and /api/part_attachments/{id}/getFile (with Range
+requests). Every response can be delayed and a fraction of requests can
+be answered with 503 to exercise retries.
+
+Usage: python -m benchmarks.fake_partkeepr --parts 10000 --port 8080 --latency 0.005 --error-rate 0.01
+"""
+import argparse
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit, parse_qs
+from .inventory import InventoryGenerator
+
+# fields of a part which are not sent back in put requests and are kept from the stored copy
+SERVER_FIELDS = ["@id", "@type", "averagePrice", "createDate", "lowStock", "stockLevel", "removals"]
+
+
+class FakePartkeepr:
+    """Parts are generated when they are requested, only parts updated by PUT are stored, so inventories of million
+    parts can be served."""
+
+    def __init__(self, part_count, seed=0, latency=0.0, error_rate=0.0, default_page_size=30):
+        self.generator = InventoryGenerator(seed)
+        self.units = self.generator.units
+        self.part_count = part_count
+        self.updated = {}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.default_page_size = default_page_size
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)
+        self.request_count = 0
+
+    def handle(self, method, path, query, body):
+        """Returns (status code, response document)"""
+        with self.lock:
+            self.request_count += 1
+            fail = self.random.random() < self.error_rate
+        if self.latency > 0:
+            time.sleep(self.latency)
+        if fail:
+            return 503, {"@type": "hydra:Error", "hydra:description": "injected error"}
+        if method == 'GET' and path == '/api/parts':
+            return 200, self.collection(path, range(self.part_count), query, self.part)
+        if method == 'GET' and path == '/api/units':
+            return 200, self.collection(path, self.units, query, lambda unit: unit)
+        if method == 'GET' and path == '/api/parts/getPartParameterNames':
+            return 200, self.parameter_names()
+        if method == 'GET' and path.startswith('/api/part_attachments/') and path.endswith('/getFile'):
+            content = self.attachment_content(path[:-len('/getFile')])
+            if content is not None:
+                return 200, content
+        if path.startswith('/api/parts/') and self.exists(path):
+            if method == 'GET':
+                part = dict(self.get(path))
+                part['@context'] = '/api/contexts/Part'
+                return 200, part
+            if method == 'PUT':
+                return 200, self.update(path, body)
+        return 404, {"@type": "hydra:Error", "hydra:description": "Not Found"}
+
+    def collection(self, path, items, query, to_member):
+        page = int(query.get('page', ['1'])[-1])
+        page_size = int(query.get('itemsPerPage', [str(self.default_page_size)])[-1])
+        first = (page - 1) * page_size
+        document = {"@context": "/api/contexts/" + path.split('/')[-1], "@id": path, "@type": "hydra:Collection",
+                    "hydra:totalItems": len(items),
+                    "hydra:member": [to_member(item) for item in items[first:first + page_size]]}
+        view = {"@id": path + "?page=" + str(page) + "&itemsPerPage=" + str(page_size),
+                "@type": "hydra:PartialCollectionView"}
+        if first + page_size < len(items):
+            view["hydra:next"] = path + "?page=" + str(page + 1) + "&itemsPerPage=" + str(page_size)
+        document["hydra:view"] = view
+        return document
+
+    def exists(self, part_id):
+        try:
+            return 0 <= self.generator.part_index(part_id) < self.part_count
+        except ValueError:
+            return False
+
+    def part(self, index):
+        part_id = "/api/parts/" + str(index + 1)
+        with self.lock:
+            part = self.updated.get(part_id)
+        return part if part is not None else self.generator.part(index)
+
+    def get(self, part_id):
+        return self.part(self.generator.part_index(part_id))
+
+    def attachment_content(self, attachment_id):
+        """Returns bytes of the attachment, attachments with the same original file name (datasheet of a series) have
+        the same content, None if there is no such attachment"""
+        try:
+            index = (int(attachment_id[len('/api/part_attachments/'):]) - 1) // 2
+        except ValueError:
+            return None
+        if not 0 <= index < self.part_count:
+            return None
+        for attachment in self.part(index)['attachments']:
+            if attachment['@id'] == attachment_id:
+                block = hashlib.sha256(attachment['originalFilename'].encode('utf-8')).digest() * 1024
+                return (block * (attachment['size'] // len(block) + 1))[:attachment['size']]
+
+    def parameter_names(self):
+        names = {}
+        for index in range(min(self.part_count, 1000)):
+            for parameter in self.part(index)['parameters']:
+                unit_name = parameter['unit']['name'] if parameter['unit'] else None
+                names.setdefault(parameter['name'], {"name": parameter['name'], "description": parameter['description'],
+                                                     "valueType": parameter['valueType'], "unitName": unit_name})
+        return list(names.values())
+
+    def update(self, part_id, body):
+        part = json.loads(body.decode('utf-8'))
+        old = self.get(part_id)
+        for field in SERVER_FIELDS:
+            part[field] = old[field]
+        part['categoryPath'] = old['categoryPath']
+        with self.lock:
+            self.updated[part_id] = part
+        return part
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # headers and body are separate writes, with Nagle's algorithm the body waits for delayed ACK of the headers
+    # (~40ms on keep-alive connections) and the benchmark would measure that instead of the connector
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.__respond()
+
+    def do_PUT(self):
+        self.__respond()
+
+    def __respond(self):
+        url = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length) if length > 0 else b''
+        status, document = self.server.partkeepr.handle(self.command, url.path, parse_qs(url.query), body)
+        if isinstance(document, bytes):
+            self.__respond_file(document)
+            return
+        content = json.dumps(document).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/ld+json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def __respond_file(self, content):
+        # only 'bytes=<first>-' ranges are supported, as sent by resumed downloads
+        requested = self.headers.get('Range', '')
+        first = int(requested[len('bytes='):].split('-')[0]) if requested.startswith('bytes=') else None
+        if first is not None and first >= len(content):
+            self.send_response(416)
+            self.send_header('Content-Range', 'bytes */' + str(len(content)))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if first is not None:
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes ' + str(first) + '-' + str(len(content) - 1) + '/' +
+                             str(len(content)))
+            content = content[first:]
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakePartkeeprServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, partkeepr, host='127.0.0.1', port=0):
+        HTTPServer.__init__(self, (host, port), RequestHandler)
+        self.partkeepr = partkeepr
+
+    @property
+    def url(self):
+        return "http://" + self.server_address[0] + ":" + str(self.server_address[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake Partkeepr API server with synthetic inventory")
+    parser.add_argument('--parts', type=int, default=1000, help="number of generated parts")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0, help="0 to pick a free port")
+    parser.add_argument('--latency', type=float, default=0.0, help="delay of every response in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args()
+    partkeepr = FakePartkeepr(args.parts, seed=args.seed, latency=args.latency, error_rate=args.error_rate)
+    server = FakePartkeeprServer(partkeepr, args.host, args.port)
+    print(server.url)
+    sys.stdout.flush()
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
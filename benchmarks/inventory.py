@@ -0,0 +1,245 @@
+"""Synthetic Partkeepr inventory: resistors, capacitors and inductors as returned by /api/parts.
+
+Usage: python -m benchmarks.inventory --parts 1000000 --output inventory.ndjson.gz
+"""
+import argparse
+import random
+import sys
+
+CATEGORY_ROOT = "Root Category"
+
+SI_PREFIXES = [('pico', 'p', -12), ('nano', 'n', -9), ('micro', 'μ', -6), ('milli', 'm', -3), ('-', '', 0),
+               ('kilo', 'k', 3), ('mega', 'M', 6), ('giga', 'G', 9)]
+
+UNITS = [('Ohm', 'Ω', ['-', 'milli', 'kilo', 'mega', 'giga']),
+         ('Farad', 'F', ['pico', 'nano', 'micro', 'milli', '-']),
+         ('Henry', 'H', ['nano', 'micro', 'milli', '-']),
+         ('Watt', 'W', ['milli', '-', 'kilo']),
+         ('Volt', 'V', ['milli', '-', 'kilo']),
+         ('Ampere', 'A', ['micro', 'milli', '-']),
+         ('Hertz', 'Hz', ['-', 'kilo', 'mega', 'giga']),
+         ('Celsius', '°C', ['-'])]
+
+MANUFACTURERS = {'resistors': ['Yageo', 'Vishay', 'Panasonic', 'Bourns', 'KOA Speer'],
+                 'capacitors': ['Samsung', 'Murata', 'Kemet', 'TDK', 'AVX'],
+                 'inductors': ['Bourns', 'Murata', 'TDK', 'Wurth Elektronik', 'Coilcraft']}
+
+FOOTPRINTS = ['0402', '0603', '0805', '1206', '2512']
+
+BASE36_DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def base36(number):
+    digits = ''
+    while True:
+        number, digit = divmod(number, 36)
+        digits = BASE36_DIGITS[digit] + digits
+        if number == 0:
+            return digits
+
+
+def generate_units():
+    """Returns units collection members as returned by /api/units"""
+    prefixes = {}
+    for i, (name, symbol, exponent) in enumerate(SI_PREFIXES):
+        prefixes[name] = {"@id": "/api/si_prefixes/" + str(i + 1), "@type": "SiPrefix", "prefix": name,
+                          "symbol": symbol, "exponent": exponent, "base": 10}
+    units = []
+    for i, (name, symbol, unit_prefixes) in enumerate(UNITS):
+        units.append({"@id": "/api/units/" + str(i + 1), "@type": "Unit", "name": name, "symbol": symbol,
+                      "prefixes": [prefixes[prefix] for prefix in unit_prefixes]})
+    return units
+
+
+class InventoryGenerator:
+    """Generates synthetic Partkeepr parts (resistors, capacitors and inductors) in the format returned by /api/parts.
+
+    Parts are generated lazily and depend only on seed and part index, so the same inventory can be reproduced at any
+    size without keeping it in memory.
+    """
+
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.units = generate_units()
+        self.units_by_name = {unit['name']: unit for unit in self.units}
+
+    def parts(self, count, start=0):
+        """Yields `count` parts starting with part of index `start`"""
+        for index in range(start, start + count):
+            yield self.part(index)
+
+    @staticmethod
+    def part_index(part_id):
+        """Index of part with given @id, inverse of part(index)['@id']"""
+        return int(part_id.rsplit('/', 1)[-1]) - 1
+
+    def part(self, index):
+        rng = random.Random(self.seed * 1000003 + index)
+        component_type = ['resistors', 'capacitors', 'inductors'][index % 3]
+        part_id = "/api/parts/" + str(index + 1)
+        manufacturer = rng.choice(MANUFACTURERS[component_type])
+        production = 'THT' if rng.random() < 0.1 else 'SMD'
+        footprint = rng.choice(FOOTPRINTS) if production == 'SMD' else None
+        # index in the part number keeps part numbers unique up to any inventory size
+        part_number = manufacturer[:3].upper() + (footprint or "THT") + "-" + base36(index) + str(rng.randint(0, 9))
+        parameters = {'resistors': self.__resistors_parameters,
+                      'capacitors': self.__capacitors_parameters,
+                      'inductors': self.__inductors_parameters}[component_type](rng)
+        category_name = component_type.capitalize()
+        category = {"@id": "/api/part_categories/" + str(index % 3 + 2), "@type": "PartCategory",
+                    "name": category_name, "description": "", "categoryPath": CATEGORY_ROOT + " ➤ " + category_name}
+        return {"@id": part_id,
+                "@type": "Part",
+                "name": part_number,
+                "description": "",
+                "comment": "",
+                "productionRemarks": production,
+                "categoryPath": category["categoryPath"],
+                "category": category,
+                "footprint": {"@id": "/api/footprints/" + str(FOOTPRINTS.index(footprint) + 1), "@type": "Footprint",
+                              "name": footprint, "description": ""} if footprint is not None else None,
+                "storageLocation": {"@id": "/api/storage_locations/1", "@type": "StorageLocation", "name": "Box 1",
+                                    "category": {"@id": "/api/storage_location_categories/1",
+                                                 "@type": "StorageLocationCategory", "name": CATEGORY_ROOT}},
+                "parameters": parameters,
+                "manufacturers": self.__manufacturers(rng, index, component_type, manufacturer, part_number),
+                "attachments": self.__attachments(rng, index),
+                "distributors": [],
+                "averagePrice": "0.0000",
+                "createDate": "2019-01-01T00:00:00+00:00",
+                "lowStock": False,
+                "stockLevel": rng.randint(0, 5000),
+                "minStockLevel": 0,
+                "removals": False,
+                "needsReview": False,
+                "status": "",
+                "partCondition": "",
+                "internalPartNumber": "",
+                "metaPart": False,
+                "metaPartParameterCriterias": [],
+                "projectParts": [],
+                "stockLevels": []}
+
+    def __manufacturers(self, rng, index, component_type, manufacturer, part_number):
+        """Most parts have one manufacturer, a few have none or a second source, as in real inventories"""
+        count = rng.choices([0, 1, 2], weights=[2, 95, 3])[0]
+        manufacturers = []
+        for i in range(count):
+            name = manufacturer if i == 0 else rng.choice(MANUFACTURERS[component_type])
+            manufacturers.append({"@id": "/api/part_manufacturers/" + str(index * 2 + i + 1),
+                                  "@type": "PartManufacturer",
+                                  "manufacturer": {"@id": "/api/manufacturers/" + str(
+                                      MANUFACTURERS[component_type].index(name) + 1), "@type": "Manufacturer",
+                                                   "name": name},
+                                  "partNumber": part_number if i == 0 else part_number + "-ALT"})
+        return manufacturers
+
+    def __attachments(self, rng, index):
+        # datasheets are shared by parts of the same series, ~40% of parts have one, a few have an image too
+        attachments = []
+        if rng.random() < 0.4:
+            series = index // 10
+            attachments.append({"@id": "/api/part_attachments/" + str(index * 2 + 1), "@type": "PartAttachment",
+                                "originalFilename": "datasheet_" + str(series + 1) + ".pdf",
+                                "mimetype": "application/pdf", "size": 50000 + series * 7919 % 1950000,
+                                "description": "Datasheet", "isImage": False,
+                                "created": "2019-01-01T00:00:00+00:00"})
+        if rng.random() < 0.05:
+            attachments.append({"@id": "/api/part_attachments/" + str(index * 2 + 2), "@type": "PartAttachment",
+                                "originalFilename": "photo_" + str(index + 1) + ".jpg", "mimetype": "image/jpeg",
+                                "size": rng.randint(20000, 500000), "description": "", "isImage": True,
+                                "created": "2019-01-01T00:00:00+00:00"})
+        return attachments
+
+    def numeric_parameter(self, name, unit_name, value=None, min_value=None, max_value=None, prefix='-',
+                          min_prefix='-', max_prefix='-'):
+        unit = self.units_by_name[unit_name] if unit_name is not None else None
+
+        def si_prefix(prefix_name, prefix_value):
+            if unit is None or prefix_value is None:
+                return None
+            for si_prefix in unit['prefixes']:
+                if si_prefix['prefix'] == prefix_name:
+                    return si_prefix
+
+        return {"@type": "PartParameter", "name": name, "description": "", "valueType": "numeric",
+                "value": value, "minValue": min_value, "maxValue": max_value,
+                "normalizedValue": None, "normalizedMinValue": None, "normalizedMaxValue": None,
+                "stringValue": "", "unit": unit, "siPrefix": si_prefix(prefix, value),
+                "minSiPrefix": si_prefix(min_prefix, min_value), "maxSiPrefix": si_prefix(max_prefix, max_value)}
+
+    def string_parameter(self, name, value):
+        return {"@type": "PartParameter", "name": name, "description": "", "valueType": "string", "value": None,
+                "minValue": None, "maxValue": None, "normalizedValue": None, "normalizedMinValue": None,
+                "normalizedMaxValue": None, "stringValue": value, "unit": None, "siPrefix": None,
+                "minSiPrefix": None, "maxSiPrefix": None}
+
+    def __working_temperature(self, rng):
+        return self.numeric_parameter("Working Temperature", "Celsius", min_value=rng.choice([-55, -40]),
+                                      max_value=rng.choice([85, 125, 155]))
+
+    def __common_parameters(self, rng):
+        return [self.__working_temperature(rng),
+                self.numeric_parameter("Tolerance", None, min_value=-rng.choice([1, 5, 10]),
+                                       max_value=rng.choice([1, 5, 10]))]
+
+    def __resistors_parameters(self, rng):
+        prefix = rng.choice(['-', 'kilo', 'mega'])
+        return [self.numeric_parameter("Resistance", "Ohm", value=rng.choice([1, 2.2, 4.7, 10, 47, 100, 470]),
+                                       prefix=prefix),
+                self.numeric_parameter("Power", "Watt", max_value=rng.choice([62.5, 100, 125, 250]),
+                                       max_prefix='milli'),
+                self.numeric_parameter("Voltage", "Volt", max_value=rng.choice([50, 75, 150, 200])),
+                self.string_parameter("Part Type", "Thick Film Resistor")] + self.__common_parameters(rng)
+
+    def __capacitors_parameters(self, rng):
+        prefix = rng.choice(['pico', 'nano', 'micro'])
+        if rng.random() < 0.05:
+            # trimmer capacitors have capacitance range
+            capacitance = self.numeric_parameter("Capacitance", "Farad", min_value=rng.choice([2, 5]),
+                                                 max_value=rng.choice([20, 30, 50]), min_prefix='pico',
+                                                 max_prefix='pico')
+        else:
+            capacitance = self.numeric_parameter("Capacitance", "Farad",
+                                                 value=rng.choice([1, 2.2, 4.7, 10, 22, 47, 100]), prefix=prefix)
+        if prefix == 'pico' and rng.random() < 0.5:
+            # small capacitors have absolute tolerance
+            tolerance = self.numeric_parameter("Tolerance", "Farad", value=rng.choice([0.1, 0.25, 0.5]),
+                                               prefix='pico')
+        else:
+            percent = rng.choice([5, 10, 20])
+            tolerance = self.numeric_parameter("Tolerance", None, min_value=-percent, max_value=percent)
+        return [capacitance,
+                self.numeric_parameter("Voltage", "Volt", value=rng.choice([6.3, 10, 16, 25, 50])),
+                self.string_parameter("Capacitor Type", "MLCC"),
+                self.string_parameter("Dielectric Type", rng.choice(["X7R", "X5R", "C0G"])),
+                tolerance, self.__working_temperature(rng)]
+
+    def __inductors_parameters(self, rng):
+        return [self.numeric_parameter("Inductance", "Henry", value=rng.choice([1, 2.2, 4.7, 10, 22, 47]),
+                                       prefix=rng.choice(['nano', 'micro'])),
+                self.numeric_parameter("Rated Current", "Ampere", value=rng.choice([100, 250, 500]),
+                                       prefix='milli'),
+                self.numeric_parameter("Self Resonant Frequency", "Hertz", value=rng.choice([10, 50, 100]),
+                                       prefix='mega'),
+                self.numeric_parameter("Q", None, value=rng.choice([8, 10, 20])),
+                self.string_parameter("Part Type", "Multilayer")] + self.__common_parameters(rng)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic Partkeepr parts as NDJSON, one part per line")
+    parser.add_argument('--parts', type=int, default=1000, help="number of parts")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', required=True, help="output file, gzip compressed when it ends with .gz")
+    args = parser.parse_args()
+
+    from partkeepr_connector.export import NdjsonWriter
+    generator = InventoryGenerator(args.seed)
+    with NdjsonWriter(args.output) as writer:
+        for part in generator.parts(args.parts):
+            writer.write(part)
+    print("Written", writer.count, "parts into", args.output, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+"""Microbenchmarks of the inventory processing hot paths on synthetic inventory.
+
+Every benchmark prepares its input outside of the measured time and then processes all items `--repeat` times, the
+best and median time per item are reported. Benchmarks needing a Partkeepr server use the fake server running in this
+process. A benchmark whose dependencies (requests, partname-resolver submodule) are missing is reported as skipped.
+
+Results are saved as JSON together with the commit they were measured on, --compare prints the change against
+results of another commit.
+
+Usage: python -m benchmarks.micro_benchmark --sizes 1000 10000 --output micro.json --compare micro_master.json
+"""
+import argparse
+import configparser
+import copy
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from .inventory import InventoryGenerator
+
+
+def repository_root():
+    return os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+class Inventory:
+    """Synthetic inventory of one size with lazily made derived forms shared by the benchmarks"""
+
+    def __init__(self, size, seed=0):
+        self.size = size
+        self.generator = InventoryGenerator(seed)
+        self.__parts = None
+        self.__decoded = None
+        self.__server = None
+        self.__partkeepr = None
+        self.__directories = []
+
+    def temporary_directory(self):
+        """Directory removed by close()"""
+        self.__directories.append(tempfile.mkdtemp(prefix='micro_benchmark_'))
+        return self.__directories[-1]
+
+    @property
+    def parts(self):
+        if self.__parts is None:
+            self.__parts = list(self.generator.parts(self.size))
+        return self.__parts
+
+    @property
+    def decoded(self):
+        """Decoded parts by component type, as read by validators from export, values are strings there"""
+        if self.__decoded is None:
+            from partkeepr_connector.parameter_decoder import decode_parameters
+            from partkeepr_connector.export import DecimalEncoder
+            self.__decoded = {}
+            for part in self.parts:
+                component_type = part['categoryPath'].rsplit(' ', 1)[-1].lower()
+                decoded = {'name': part['name'], 'description': part['description'],
+                           'parameters': decode_parameters(part['parameters']),
+                           'manufacturers': [{'name': manufacturer['manufacturer']['name'],
+                                              'partNumber': manufacturer['partNumber']}
+                                             for manufacturer in part['manufacturers']],
+                           'footprint': part['footprint']['name'] if part['footprint'] else "",
+                           'productionRemarks': part['productionRemarks'], 'partkeepr_id': part['@id']}
+                decoded = json.loads(json.dumps(decoded, cls=DecimalEncoder))
+                self.__decoded.setdefault(component_type, []).append(decoded)
+        return self.__decoded
+
+    def config(self, url):
+        config = configparser.ConfigParser()
+        config.read_dict({'partkeepr': {'url': url, 'user': 'benchmark', 'pwd': 'benchmark', 'page_size': '500',
+                                        'export_format': 'ndjson', 'units_cache': ''},
+                          'partkeepr component location': {
+                              'resistors': '"Root Category ➤ Resistors"',
+                              'capacitors': '"Root Category ➤ Capacitors"',
+                              'inductors': '"Root Category ➤ Inductors"'}})
+        return config
+
+    def partkeepr(self):
+        """Partkeepr connected to fake server serving this inventory"""
+        if self.__partkeepr is None:
+            from partkeepr_connector.partkeepr import Partkeepr
+            from .fake_partkeepr import FakePartkeepr, FakePartkeeprServer
+            self.__server = FakePartkeeprServer(FakePartkeepr(self.size, default_page_size=500))
+            threading.Thread(target=self.__server.serve_forever, daemon=True).start()
+            # Partkeepr opens its partkeepr_<time>.log in the current directory
+            cwd = os.getcwd()
+            os.chdir(self.temporary_directory())
+            try:
+                self.__partkeepr = Partkeepr(self.config(self.__server.url))
+            finally:
+                os.chdir(cwd)
+        return self.__partkeepr
+
+    def part_objects(self, component_type, limit=1000):
+        """Part objects fetched from fake server, at most `limit` of them"""
+        partkeepr = self.partkeepr()
+        ids = [part['@id'].replace('/api/parts/', '') for part in self.parts
+               if part['categoryPath'].endswith(component_type.capitalize())][:limit]
+        return [partkeepr.get_part(part_id) for part_id in ids]
+
+    def close(self):
+        if self.__partkeepr is not None:
+            self.__partkeepr.close()
+            self.__server.shutdown()
+            self.__server.server_close()
+        for directory in self.__directories:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+# Benchmarks: function(inventory) -> (number of items, function processing all items once)
+
+def decode_parameters_benchmark(inventory):
+    from partkeepr_connector.parameter_decoder import decode_parameters
+    parameters = [part['parameters'] for part in inventory.parts]
+    return len(parameters), lambda: [decode_parameters(item) for item in parameters]
+
+
+def decode_part_benchmark(inventory):
+    partkeepr = inventory.partkeepr()
+    parts = inventory.parts
+    return len(parts), lambda: [partkeepr.decode_part(part) for part in parts]
+
+
+def units_get_supported_prefixes_benchmark(inventory):
+    from partkeepr_connector.partkeepr_units import Units
+    units = Units(inventory.generator.units)
+    parameter_units = [parameter['unit'] for part in inventory.parts for parameter in part['parameters']
+                       if parameter['unit'] is not None]
+    return len(parameter_units), lambda: [units.get_supported_prefixes(unit) for unit in parameter_units]
+
+
+def units_get_prefix_benchmark(inventory):
+    from partkeepr_connector.partkeepr_units import Units
+    units = Units(inventory.generator.units)
+    prefixes = [(parameter['unit'], parameter['siPrefix']['prefix']) for part in inventory.parts
+                for parameter in part['parameters'] if parameter['unit'] is not None and parameter['siPrefix']]
+    return len(prefixes), lambda: [units.get_prefix(unit, prefix) for unit, prefix in prefixes]
+
+
+def part_add_parameter_benchmark(inventory):
+    from partkeepr_connector.part import Part
+    from partkeepr_connector.part_to_component import part_to_inductor
+    inputs = []
+    for part in inventory.part_objects('inductors'):
+        inductor = part_to_inductor(part)
+        request = copy.deepcopy(part.request)
+        request['parameters'] = []
+        values = [(name, value) for name, value in [('Inductance', inductor.inductance),
+                                                    ('Working Temperature', inductor.working_temperature_range),
+                                                    ('Rated Current', inductor.rated_current),
+                                                    ('Self Resonant Frequency', inductor.self_resonant_frequency)]
+                  if value is not None]
+        inputs.append((part.get_id(), request, part.units, values))
+
+    def run():
+        for part_id, request, units, values in inputs:
+            # parameters list is filled by the part, every run starts from an empty one
+            part = Part(part_id, dict(request, parameters=[]), units)
+            for name, value in values:
+                part.add_parameter(name, value)
+            # added parameters are moved into the put request when it is read
+            part.request
+
+    return sum(len(values) for _, _, _, values in inputs), run
+
+
+def resistor_from_partkeepr_json_benchmark(inventory):
+    sys.path.insert(0, repository_root())
+    from common import resistor_from_partkeepr_json
+    resistors = inventory.decoded['resistors']
+    return len(resistors), lambda: [resistor_from_partkeepr_json(resistor) for resistor in resistors]
+
+
+def capacitor_from_partkeepr_json_benchmark(inventory):
+    sys.path.insert(0, repository_root())
+    from common import capacitor_from_partkeepr_json
+    capacitors = inventory.decoded['capacitors']
+    return len(capacitors), lambda: [capacitor_from_partkeepr_json(capacitor) for capacitor in capacitors]
+
+
+def part_to_inductor_benchmark(inventory):
+    from partkeepr_connector.part_to_component import part_to_inductor
+    parts = inventory.part_objects('inductors')
+    return len(parts), lambda: [part_to_inductor(part) for part in parts]
+
+
+def get_components_benchmark(inventory):
+    partkeepr = inventory.partkeepr()
+    directory = inventory.temporary_directory()
+
+    def run():
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            partkeepr.get_components()
+        finally:
+            os.chdir(cwd)
+
+    return inventory.size, run
+
+
+BENCHMARKS = {'decode_parameters': decode_parameters_benchmark,
+              'decode_part': decode_part_benchmark,
+              'Units.get_supported_prefixes': units_get_supported_prefixes_benchmark,
+              'Units.get_prefix': units_get_prefix_benchmark,
+              'Part.add_parameter': part_add_parameter_benchmark,
+              'resistor_from_partkeepr_json': resistor_from_partkeepr_json_benchmark,
+              'capacitor_from_partkeepr_json': capacitor_from_partkeepr_json_benchmark,
+              'part_to_inductor': part_to_inductor_benchmark,
+              'get_components': get_components_benchmark}
+
+
+def measure(name, inventory, repeat):
+    result = {'benchmark': name, 'size': inventory.size}
+    try:
+        items, function = BENCHMARKS[name](inventory)
+        times = []
+        for i in range(repeat):
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+    except ImportError as error:
+        result['skipped'] = str(error)
+        return result
+    except Exception as error:
+        # a broken benchmark doesn't stop the others
+        result['error'] = type(error).__name__ + ": " + str(error)
+        return result
+    result.update({'items': items, 'best_seconds': min(times), 'median_seconds': statistics.median(times),
+                   'best_us_per_item': min(times) / max(items, 1) * 1e6})
+    return result
+
+
+def commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=repository_root(), universal_newlines=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_result(result, baseline=None):
+    if 'skipped' in result:
+        return "{:>30} {:>8}: skipped, {}".format(result['benchmark'], result['size'], result['skipped'])
+    if 'error' in result:
+        return "{:>30} {:>8}: failed, {}".format(result['benchmark'], result['size'], result['error'])
+    line = "{:>30} {:>8}: {:10.2f}us per item, best {:8.3f}s, median {:8.3f}s".format(
+        result['benchmark'], result['size'], result['best_us_per_item'], result['best_seconds'],
+        result['median_seconds'])
+    if baseline is not None and 'best_us_per_item' in baseline:
+        line += ", {:+.1f}% vs baseline".format(
+            (result['best_us_per_item'] / baseline['best_us_per_item'] - 1) * 100)
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks of inventory processing on synthetic inventory")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help="inventory sizes")
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=5, help="measured runs of every benchmark")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="save results into JSON file")
+    parser.add_argument('--compare', help="JSON results of another run to compare with")
+    args = parser.parse_args()
+
+    sys.path.insert(0, repository_root())
+    baseline = {}
+    if args.compare is not None:
+        with open(args.compare) as file:
+            baseline = {(result['benchmark'], result['size']): result for result in json.load(file)['results']}
+
+    results = []
+    for size in args.sizes:
+        inventory = Inventory(size, args.seed)
+        try:
+            for name in args.benchmarks:
+                result = measure(name, inventory, args.repeat)
+                results.append(result)
+                print(format_result(result, baseline.get((name, size))))
+        finally:
+            inventory.close()
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump({'commit': commit(), 'python': platform.python_version(), 'platform': platform.platform(),
+                       'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'repeat': args.repeat, 'results': results},
+                      file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Cold start benchmark of the command line tools.
+
+Every case is run `--runs` times in a fresh interpreter, median wall time is compared with the budget. Exit status is
+1 when any case is over budget, so the benchmark can guard startup time in CI. The cases must not need config.ini or
+a Partkeepr server, startup doesn't do any network I/O.
+
+Usage: python -m benchmarks.startup_benchmark --budget 0.3 --output startup_benchmark.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CASES = {'cli --help': ['cli.py', '--help'],
+         'cli validate --help': ['cli.py', 'validate', '--help'],
+         'import validate': ['-c', 'import validate'],
+         'import partkeepr_connector.partkeepr': ['-c', 'import partkeepr_connector.partkeepr']}
+
+
+def repository_root():
+    return os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+def run_case(arguments, runs):
+    times = []
+    for i in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable] + arguments, cwd=repository_root(), stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE, universal_newlines=True)
+        times.append(time.perf_counter() - start)
+        if completed.returncode != 0:
+            return {'error': completed.stderr.strip().splitlines()[-1]}
+    return {'median': statistics.median(times), 'min': min(times), 'max': max(times)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Command line tools cold start benchmark")
+    parser.add_argument('--runs', type=int, default=10, help="runs of every case")
+    parser.add_argument('--budget', type=float, default=0.3, help="maximal median startup time in seconds")
+    parser.add_argument('--output', help="save results into JSON file")
+    args = parser.parse_args()
+
+    # baseline: interpreter startup alone
+    baseline = run_case(['-c', 'pass'], args.runs)
+    print("{:>40}: {:8.1f}ms".format('python -c pass', baseline['median'] * 1000))
+    results = {'python -c pass': baseline}
+    over_budget = False
+    for name, arguments in CASES.items():
+        result = run_case(arguments, args.runs)
+        results[name] = result
+        if 'error' in result:
+            print("{:>40}: failed, {}".format(name, result['error']))
+            over_budget = True
+            continue
+        verdict = 'ok' if result['median'] <= args.budget else 'OVER BUDGET'
+        over_budget = over_budget or result['median'] > args.budget
+        print("{:>40}: {:8.1f}ms {}".format(name, result['median'] * 1000, verdict))
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump({'budget': args.budget, 'results': results}, file, indent=4)
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""Command line entry point, run `python cli.py --help` for the list of commands.
+
+Modules of the commands (partname-resolver decoders, requests, validation rules) are imported only when the command
+runs and nothing is downloaded from Partkeepr unless the command needs it, so --help and local commands start fast.
+"""
+import argparse
+import sys
+
+
+def read_config(filename):
+    import configparser
+    config = configparser.ConfigParser()
+    config.read(filename)
+    return config
+
+
+def sync(args):
+    from partkeepr_connector.partkeepr import Partkeepr
+    config = read_config(args.config)
+    with Partkeepr(config) as partkeepr:
+        if partkeepr.snapshot is None:
+            print("Snapshot is not configured, set [snapshot] location in", args.config)
+            return 1
+        partkeepr.sync_snapshot()
+    return 0
+
+
+def mirror(args):
+    from partkeepr_connector.partkeepr import Partkeepr
+    config = read_config(args.config)
+    with Partkeepr(config) as partkeepr:
+        if partkeepr.attachment_mirror is None:
+            print("Attachment mirror is not configured, set [attachments] location in", args.config)
+            return 1
+        stats = partkeepr.sync_attachments()
+    return 1 if stats['failed'] else 0
+
+
+def export(args):
+    from partkeepr_connector.partkeepr import Partkeepr
+    with Partkeepr(read_config(args.config)) as partkeepr:
+        partkeepr.get_components(export_format=args.format)
+    return 0
+
+
+def validate(args):
+    from validation.unittest_adapter import validation_report
+    config = read_config(args.config)
+    if not args.offline:
+        from partkeepr_connector.partkeepr import Partkeepr
+        with Partkeepr(config) as partkeepr:
+            partkeepr.get_components()
+    report = validation_report(jobs=args.jobs, full=args.full, config=config)
+    report.print_summary(verbose=args.verbose)
+    return 0 if report.passed else 1
+
+
+def autofill_inductors(args):
+    from autofill_inductors import AutoFillInductors
+    autofill = AutoFillInductors(args.config)
+    try:
+        failed = autofill.run(args.parts, dry_run=args.dry_run, workers=args.workers)
+    finally:
+        autofill.close()
+    return 1 if failed else 0
+
+
+def autofill_description(args):
+    from autofill_description import AutofillDescription
+    autofill = AutofillDescription(args.config)
+    try:
+        # one block for both, so a part edited by both steps gets a single PUT
+        with autofill.partkeepr.changes():
+            autofill.autofill_resistors_description()
+            autofill.autofill_capacitors_description()
+        autofill.print_unused_skip_entries()
+    finally:
+        autofill.close()
+    return 0
+
+
+def parser():
+    main_parser = argparse.ArgumentParser(description="Partkeepr inventory validator and autofill")
+    main_parser.add_argument('--config', default="config.ini", help="config file, default config.ini")
+    main_parser.add_argument('--metrics-file', default=None,
+                             help="write Partkeepr API metrics in Prometheus text format into this file, defaults to "
+                                  "[metrics] prometheus_file config value")
+    main_parser.add_argument('--profile', action='store_true',
+                             help="print time spent in fetch, decode, resolve, compare and write stages per category")
+    main_parser.add_argument('--profile-parts', type=int, default=0, metavar='N',
+                             help="with --profile, write cProfile statistics of N slowest parts into --profile-dir")
+    main_parser.add_argument('--profile-dir', default="profiles", help="directory for --profile-parts statistics")
+    commands = main_parser.add_subparsers(dest='command')
+    commands.required = True
+
+    command = commands.add_parser('sync', help="update local inventory snapshot")
+    command.set_defaults(function=sync)
+
+    command = commands.add_parser('mirror', help="download new and changed part attachments into attachment mirror")
+    command.set_defaults(function=mirror)
+
+    command = commands.add_parser('export', help="download parts and export them grouped by component type")
+    command.add_argument('--format', choices=['ndjson', 'ndjson.gz', 'json'], default=None,
+                         help="export format, defaults to [partkeepr] export_format config value")
+    command.set_defaults(function=export)
+
+    command = commands.add_parser('validate', help="validate resistors, capacitors and inductors")
+    command.add_argument('--jobs', type=int, default=None,
+                         help="number of validation processes, defaults to [validator] jobs config value")
+    command.add_argument('--full', action='store_true',
+                         help="validate all parts, not only parts changed since the last validation")
+    command.add_argument('--offline', action='store_true',
+                         help="validate components exported or synchronized before, without contacting Partkeepr")
+    command.add_argument('--verbose', action='store_true', help="list skipped parts too")
+    command.set_defaults(function=validate)
+
+    command = commands.add_parser('autofill-inductors',
+                                  help="fill inductor parameters decoded from manufacturer part number")
+    command.add_argument('parts', nargs='+', help="partkeepr ids of parts to fill, e.g. 1234")
+    command.add_argument('--dry-run', action='store_true', help="print updated parts instead of sending them")
+    command.add_argument('--workers', type=int, default=None,
+                         help="parts processed concurrently, defaults to [autofill] workers config value")
+    command.set_defaults(function=autofill_inductors)
+
+    command = commands.add_parser('autofill-description', help="update resistors and capacitors descriptions")
+    command.set_defaults(function=autofill_description)
+    return main_parser
+
+
+def report_metrics(args):
+    """Print summary of Partkeepr API calls made by the command and write them for Prometheus if configured"""
+    from partkeepr_connector.metrics import default_registry
+    default_registry.print_summary()
+    filename = args.metrics_file
+    if filename is None:
+        filename = read_config(args.config).get("metrics", "prometheus_file", fallback="").replace('"', '')
+    if filename:
+        default_registry.write_prometheus(filename)
+
+
+def report_profile(args):
+    from partkeepr_connector import profiling
+    profiling.print_report()
+    if args.profile_parts > 0:
+        profiling.dump_slowest_parts(args.profile_dir)
+
+
+def main(argv=None):
+    args = parser().parse_args(argv)
+    if args.profile:
+        from partkeepr_connector import profiling
+        profiling.enable(args.profile_parts)
+    try:
+        return args.function(args)
+    finally:
+        report_metrics(args)
+        if args.profile:
+            report_profile(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
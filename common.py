@@ -1,16 +1,22 @@
 from decimal import Decimal
-import sys
-import os
-from pathlib import Path
+import configparser
+from partkeepr_connector.third_party import add_partname_resolver_path
 
-partname_resolver_path = Path(os.path.dirname(os.path.realpath(__file__)) + '/third_party/partname-resolver')
-sys.path.insert(1, str(partname_resolver_path.resolve()))
+add_partname_resolver_path()
 from partname_resolver.components.resistor import Resistor
 from partname_resolver.units.resistanceTolerance import Tolerance as ResistanceTolerance
 from partname_resolver.units.temperature import TemperatureRange
 from partname_resolver.units.capacitanceTolerance import Tolerance as CapacitanceTolerance
 from partname_resolver.components.capacitor import Capacitor
 from partname_resolver.units.capacitance import Capacitance, CapacitanceRange
+from partkeepr_connector.components import load_components
+from partkeepr_connector.partname_cache import resolve_partname
+
+
+def read_config(filename="config.ini"):
+    config = configparser.ConfigParser()
+    config.read(filename)
+    return config
 
 
 def tolerance_from_partkeepr_json(tolerance_json):
@@ -0,0 +1,233 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from .concurrency import ordered_map
+from .session import PartkeeprApiError
+
+CHUNK_SIZE = 1 << 16
+# index rows written between commits, so an interrupted sync keeps most of the downloaded attachments indexed
+COMMIT_INTERVAL = 100
+
+
+def open_attachment_mirror(config):
+    """Returns AttachmentMirror from [attachments] location or None when the mirror is not configured"""
+    location = config.get("attachments", "location", fallback="").replace('"', '')
+    return AttachmentMirror(location) if location else None
+
+
+def attachment_fingerprint(attachment):
+    """Partkeepr doesn't send a hash of attachment content, attachment is considered unchanged while its stored file
+    name, size and original file name stay the same"""
+    return "|".join(str(attachment.get(field)) for field in ('filename', 'size', 'originalFilename'))
+
+
+def collect_attachments(parts, attachments):
+    """Yields parts unchanged, recording their attachments into attachments dict:
+    attachment @id -> (part @id, attachment)"""
+    for part in parts:
+        for attachment in part['attachments']:
+            attachments[attachment['@id']] = (part['@id'], attachment)
+        yield part
+
+
+class AttachmentMirror:
+    """Local copy of part attachments, stored by content.
+
+    Every distinct content is stored once as objects/<sha256[:2]>/<sha256> in the mirror directory, however many
+    attachments share it (e.g. a datasheet of a whole series). The index.sqlite database maps attachment @id to the
+    hash of its content together with attachment fingerprint, so sync downloads only attachments that are new or whose
+    fingerprint changed. Downloads are written into tmp/ first and an interrupted one is resumed with Range request.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.objects = os.path.join(directory, 'objects')
+        self.tmp = os.path.join(directory, 'tmp')
+        os.makedirs(self.objects, exist_ok=True)
+        os.makedirs(self.tmp, exist_ok=True)
+        self.connection = sqlite3.connect(os.path.join(directory, 'index.sqlite'))
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS attachments (id TEXT PRIMARY KEY, part_id TEXT, "
+                                    "filename TEXT, mimetype TEXT, size INTEGER, fingerprint TEXT, sha256 TEXT, "
+                                    "synced REAL)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS attachments_part_id ON attachments (part_id)")
+
+    def object_path(self, sha256):
+        return os.path.join(self.objects, sha256[:2], sha256)
+
+    def partial_path(self, attachment_id):
+        return os.path.join(self.tmp, attachment_id.strip('/').replace('/', '_') + '.part')
+
+    def has_object(self, sha256, size):
+        try:
+            return os.path.getsize(self.object_path(sha256)) == size
+        except OSError:
+            return False
+
+    def sync(self, attachments, session, workers=8):
+        """Bring mirror up to date with attachments
+
+        :attachments: dict attachment @id -> (part @id, attachment) of all attachments on the server, attachments
+                      not in it are removed from the index and files no longer referenced are deleted
+        :session: PartkeeprSession used to download attachments
+        :workers: number of concurrent downloads
+        :returns: dict with count of added, changed, removed, unchanged and failed attachments and downloaded bytes
+        """
+        known = {attachment_id: (fingerprint, sha256, size) for attachment_id, fingerprint, sha256, size in
+                 self.connection.execute("SELECT id, fingerprint, sha256, size FROM attachments")}
+        stats = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0, 'failed': 0, 'bytes': 0}
+        to_download = []
+        with self.connection:
+            for attachment_id, (part_id, attachment) in attachments.items():
+                fingerprint = attachment_fingerprint(attachment)
+                entry = known.get(attachment_id)
+                if entry is not None and entry[0] == fingerprint and self.has_object(entry[1], entry[2]):
+                    stats['unchanged'] += 1
+                    # attachment can be moved to another part without changing its content
+                    self.connection.execute("UPDATE attachments SET part_id = ? WHERE id = ? AND part_id != ?",
+                                            (part_id, attachment_id, part_id))
+                else:
+                    to_download.append((attachment_id, part_id, attachment, fingerprint))
+
+        results = ordered_map(lambda item: self.__download_isolated(session, item[0], item[2].get('size')),
+                              to_download, workers=workers)
+        now = time.time()
+        for count, (item, (sha256, size, error)) in enumerate(zip(to_download, results)):
+            attachment_id, part_id, attachment, fingerprint = item
+            if error is not None:
+                stats['failed'] += 1
+                print("Unable to download attachment", attachment_id, "of part", part_id + ",", "reason:", error)
+                continue
+            stats['changed' if attachment_id in known else 'added'] += 1
+            stats['bytes'] += size
+            self.connection.execute("INSERT OR REPLACE INTO attachments VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                    (attachment_id, part_id, attachment['originalFilename'],
+                                     attachment.get('mimetype'), size, fingerprint, sha256, now))
+            if count % COMMIT_INTERVAL == COMMIT_INTERVAL - 1:
+                self.connection.commit()
+        self.connection.commit()
+
+        with self.connection:
+            removed = [(attachment_id,) for attachment_id in known if attachment_id not in attachments]
+            self.connection.executemany("DELETE FROM attachments WHERE id = ?", removed)
+            stats['removed'] = len(removed)
+        for (attachment_id,) in removed:
+            if os.path.exists(self.partial_path(attachment_id)):
+                os.remove(self.partial_path(attachment_id))
+        self.remove_unreferenced()
+        return stats
+
+    def __download_isolated(self, session, attachment_id, expected_size):
+        """Download attachment, retrying an interrupted transfer from where it stopped after session backoff delay,
+        returns (sha256, size, error)"""
+        attempt = 0
+        while True:
+            try:
+                return self.download(session, attachment_id, expected_size) + (None,)
+            except PartkeeprApiError as error:
+                if not error.retryable or attempt >= session.retries:
+                    return None, None, error
+            except OSError as error:
+                # requests exceptions raised while reading the body are OSErrors too
+                if attempt >= session.retries:
+                    return None, None, error
+            time.sleep(session.backoff_delay(attempt))
+            attempt += 1
+
+    def download(self, session, attachment_id, expected_size=None):
+        """Download attachment into the store, a partial download left in tmp/ is continued
+
+        :expected_size: attachment size reported by Partkeepr, checked when given
+        :returns: (sha256, size) of the attachment content
+        :raises PartkeeprApiError: when the server refused the download or sent a wrong amount of data
+        """
+        url = attachment_id + '/getFile'
+        partial = self.partial_path(attachment_id)
+        digest = hashlib.sha256()
+        offset = 0
+        if os.path.exists(partial):
+            with open(partial, 'rb') as file:
+                for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    offset += len(chunk)
+        # ranges apply to encoded content, datasheets and photos are compressed already anyway
+        headers = {'Accept-Encoding': 'identity'}
+        if offset > 0:
+            headers['Range'] = 'bytes=' + str(offset) + '-'
+        # retried by __download_isolated, which resumes from the bytes already received
+        response = session.request('get', url, headers=headers, stream=True, retries=0)
+        try:
+            if response.status_code == 416:
+                # partial download is longer than the file now on the server, start over
+                os.remove(partial)
+                raise PartkeeprApiError("416 Range Not Satisfiable for GET " + url, 'get', url, status_code=416,
+                                        retryable=True)
+            if response.status_code >= 400:
+                raise PartkeeprApiError.from_response(response, 'get', url)
+            if response.status_code != 206:
+                digest = hashlib.sha256()
+            with open(partial, 'ab' if response.status_code == 206 else 'wb') as file:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    file.write(chunk)
+                    digest.update(chunk)
+        finally:
+            response.close()
+
+        size = os.path.getsize(partial)
+        if expected_size is not None and size != expected_size:
+            if size > expected_size:
+                os.remove(partial)
+            raise PartkeeprApiError("Received " + str(size) + " bytes instead of " + str(expected_size) + " for GET " +
+                                    url, 'get', url, retryable=True)
+        sha256 = digest.hexdigest()
+        if self.has_object(sha256, size):
+            os.remove(partial)
+        else:
+            os.makedirs(os.path.dirname(self.object_path(sha256)), exist_ok=True)
+            os.replace(partial, self.object_path(sha256))
+        return sha256, size
+
+    def remove_unreferenced(self):
+        """Delete stored files which no attachment in the index refers to"""
+        referenced = {sha256 for (sha256,) in self.connection.execute("SELECT DISTINCT sha256 FROM attachments")}
+        for prefix in os.listdir(self.objects):
+            for name in os.listdir(os.path.join(self.objects, prefix)):
+                if name not in referenced:
+                    os.remove(os.path.join(self.objects, prefix, name))
+
+    def path(self, attachment_id):
+        """Path of stored attachment content, None when the attachment is not mirrored"""
+        row = self.connection.execute("SELECT sha256 FROM attachments WHERE id = ?", (attachment_id,)).fetchone()
+        return self.object_path(row[0]) if row is not None else None
+
+    def part_attachments(self, part_id):
+        """Returns list of dicts with attachment id, filename, mimetype, size and path of mirrored attachments of the
+        part"""
+        rows = self.connection.execute("SELECT id, filename, mimetype, size, sha256 FROM attachments "
+                                       "WHERE part_id = ? ORDER BY id", (part_id,))
+        return [{'id': attachment_id, 'filename': filename, 'mimetype': mimetype, 'size': size,
+                 'path': self.object_path(sha256)} for attachment_id, filename, mimetype, size, sha256 in rows]
+
+    @contextmanager
+    def open(self, attachment_id):
+        """Yields read-only memory map of attachment content, pages are read on access and shared with OS page cache,
+        so a large datasheet is neither copied nor read whole to look at a part of it
+
+        :raises KeyError: when the attachment is not mirrored
+        """
+        path = self.path(attachment_id)
+        if path is None:
+            raise KeyError(attachment_id)
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                # empty file can't be mapped
+                yield b''
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,55 @@
+CATEGORY_SEPARATOR = '➤'
+
+
+def split_category_path(category_path):
+    return [segment.strip() for segment in category_path.split(CATEGORY_SEPARATOR)]
+
+
+class CategoryRouter:
+    """Maps Partkeepr category paths to component types.
+
+    Configured category paths are compiled into a trie of path segments ('Root Category ➤ Resistors' ->
+    ['Root Category', 'Resistors']). Part category path is routed to the component type of the longest configured
+    category it lies in, walking the trie once, whatever the number of configured categories is.
+    """
+
+    def __init__(self, categories):
+        """:categories: iterable of (component type, category path) pairs"""
+        self.component_types = []
+        self.trie = {}
+        for component_type, category_path in categories:
+            self.component_types.append(component_type)
+            node = self.trie
+            for segment in split_category_path(category_path):
+                node = node.setdefault(segment, {})
+            node.setdefault(None, component_type)
+        self.cache = {}
+
+    @classmethod
+    def from_config(cls, config):
+        locations = config["partkeepr component location"]
+        return cls((key, locations[key].replace('"', '')) for key in locations)
+
+    def route(self, category_path):
+        """Returns component type of the category path or None when it is not in any configured category"""
+        if category_path in self.cache:
+            return self.cache[category_path]
+        component_type = self.trie.get(None)
+        node = self.trie
+        for segment in split_category_path(category_path):
+            node = node.get(segment)
+            if node is None:
+                break
+            component_type = node.get(None, component_type)
+        self.cache[category_path] = component_type
+        return component_type
+
+    def dispatch(self, part, handlers, default=None):
+        """Call handler registered for the component type of part
+
+        :handlers: dict component type -> function taking the part
+        :default: function called for parts without handler
+        """
+        handler = handlers.get(self.route(part['categoryPath']), default)
+        if handler is not None:
+            return handler(part)
@@ -0,0 +1,58 @@
+import copy
+from collections import OrderedDict
+from . import profiling
+
+
+class ChangeSet:
+    """Pending edits of parts, grouped by part id.
+
+    Edits are functions modifying put request of the part in place. On flush every part is fetched once, all its edits
+    are applied to that single copy and the result is sent with one PUT. Parts which end up equal to the original
+    are not sent at all. A part which can't be fetched, edited or written is recorded in `failed` and remaining parts
+    are still flushed.
+    """
+
+    def __init__(self, partkeepr, from_snapshot=False):
+        self.partkeepr = partkeepr
+        self.from_snapshot = from_snapshot
+        self.edits = OrderedDict()
+        self.failed = OrderedDict()
+
+    def add(self, part_id, edit):
+        self.edits.setdefault(part_id, []).append(edit)
+
+    def __len__(self):
+        return len(self.edits)
+
+    def __get_request(self, part_id):
+        if self.from_snapshot:
+            request = self.partkeepr.get_snapshot_component_request(part_id)
+            if request is not None:
+                return request
+        return self.partkeepr.get_component_request("/api/parts/" + part_id)
+
+    def flush(self):
+        """Send pending edits, returns list of ids of updated parts"""
+        edits, self.edits = self.edits, OrderedDict()
+        updated = []
+        try:
+            while edits:
+                part_id, part_edits = edits.popitem(last=False)
+                try:
+                    with profiling.stage('fetch'):
+                        request = self.__get_request(part_id)
+                    original = copy.deepcopy(request)
+                    for edit in part_edits:
+                        edit(request)
+                    if request != original:
+                        with profiling.stage('write'):
+                            self.partkeepr.api_call('put', '/api/parts/' + part_id, json=request)
+                        updated.append(part_id)
+                except Exception as error:
+                    # failing edit function or transport error of one part doesn't stop the remaining parts
+                    self.failed[part_id] = error
+        finally:
+            # edits not sent when flush was interrupted (e.g. KeyboardInterrupt) stay pending
+            edits.update(self.edits)
+            self.edits = edits
+        return updated
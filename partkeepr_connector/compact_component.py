@@ -0,0 +1,170 @@
+import sys
+from collections.abc import Mapping
+from decimal import Decimal
+
+ATTACHMENT_FILE_SUFFIX = '/getFile'
+
+
+class CompactRecord(Mapping):
+    """Read only dict-like record stored in __slots__.
+
+    Subclasses list their dict keys in `fields`, value of a key is kept in the slot of the same name. Records support
+    the dict read API used by validators (record['key'], get, in, len, iteration, items), to_dict returns plain
+    dict with the same content.
+    """
+    __slots__ = ()
+    fields = ()
+
+    def __getitem__(self, key):
+        if key not in self.fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __contains__(self, key):
+        return key in self.fields
+
+    def __repr__(self):
+        return type(self).__name__ + '(' + repr(self.to_dict()) + ')'
+
+    def to_dict(self):
+        return {key: to_plain(getattr(self, key)) for key in self.fields}
+
+
+class StringParameter(CompactRecord):
+    __slots__ = ('value',)
+    fields = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class NumericParameter(CompactRecord):
+    __slots__ = ('value', 'valueMin', 'valueMax')
+    fields = ('value', 'valueMin', 'valueMax')
+
+    def __init__(self, value, valueMin, valueMax):
+        self.value = value
+        self.valueMin = valueMin
+        self.valueMax = valueMax
+
+
+class UnitParameter(CompactRecord):
+    __slots__ = ('value', 'valueMin', 'valueMax', 'unit')
+    fields = ('value', 'valueMin', 'valueMax', 'unit')
+
+    def __init__(self, value, valueMin, valueMax, unit):
+        self.value = value
+        self.valueMin = valueMin
+        self.valueMax = valueMax
+        self.unit = unit
+
+
+class Manufacturer(CompactRecord):
+    __slots__ = ('name', 'partNumber')
+    fields = ('name', 'partNumber')
+
+    def __init__(self, name, partNumber):
+        self.name = name
+        self.partNumber = partNumber
+
+
+class Attachment(CompactRecord):
+    """Attachment url is made on demand from server url shared by all attachments and attachment @id"""
+    __slots__ = ('filename', 'base_url', 'attachment_id', 'description')
+    fields = ('filename', 'url', 'description')
+
+    def __init__(self, filename, base_url, attachment_id, description):
+        self.filename = filename
+        self.base_url = base_url
+        self.attachment_id = attachment_id
+        self.description = description
+
+    @property
+    def url(self):
+        return self.base_url + self.attachment_id + ATTACHMENT_FILE_SUFFIX
+
+    @classmethod
+    def from_url(cls, filename, url, description):
+        attachment_id = url
+        base_url = ''
+        api = url.find('/api/')
+        if api >= 0 and url.endswith(ATTACHMENT_FILE_SUFFIX):
+            base_url = sys.intern(url[:api])
+            attachment_id = url[api:-len(ATTACHMENT_FILE_SUFFIX)]
+        return cls(filename, base_url, attachment_id, description)
+
+
+class Component(CompactRecord):
+    """Decoded part (see Partkeepr.decode_part) kept in __slots__, repeated strings (parameter names, units,
+    footprints, category paths) are interned so all components share one copy of them. categoryPath is None for
+    parts decoded before it was added to decoded parts."""
+    __slots__ = ('name', 'description', 'parameters', 'attachments', 'comment', 'footprint', 'manufacturers',
+                 'productionRemarks', 'partkeepr_id', 'categoryPath')
+    fields = ('name', 'description', 'parameters', 'attachments', 'comment', 'footprint', 'manufacturers',
+             'productionRemarks', 'partkeepr_id', 'categoryPath')
+
+    def __init__(self, name, description, parameters, attachments, comment, footprint, manufacturers,
+                 productionRemarks, partkeepr_id, categoryPath):
+        self.name = name
+        self.description = description
+        self.parameters = parameters
+        self.attachments = attachments
+        self.comment = comment
+        self.footprint = footprint
+        self.manufacturers = manufacturers
+        self.productionRemarks = productionRemarks
+        self.partkeepr_id = partkeepr_id
+        self.categoryPath = categoryPath
+
+
+def intern_or_none(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def compact_parameter(parameter):
+    if 'unit' in parameter:
+        return UnitParameter(parameter['value'], parameter['valueMin'], parameter['valueMax'],
+                             intern_or_none(parameter['unit']))
+    if 'valueMax' in parameter:
+        return NumericParameter(parameter['value'], parameter['valueMin'], parameter['valueMax'])
+    return StringParameter(intern_or_none(parameter['value']))
+
+
+def compact_component(decoded):
+    """Convert decoded part dict into Component"""
+    return Component(decoded['name'], decoded['description'],
+                     {sys.intern(name): compact_parameter(parameter)
+                      for name, parameter in decoded['parameters'].items()},
+                     tuple(Attachment.from_url(attachment['filename'], attachment['url'], attachment['description'])
+                           for attachment in decoded['attachments']),
+                     decoded['comment'], intern_or_none(decoded['footprint']),
+                     tuple(Manufacturer(intern_or_none(manufacturer['name']), manufacturer['partNumber'])
+                           for manufacturer in decoded['manufacturers']),
+                     intern_or_none(decoded['productionRemarks']), decoded['partkeepr_id'],
+                     intern_or_none(decoded.get('categoryPath')))
+
+
+def to_plain(value):
+    """Returns value with compact records replaced by dicts and tuples by lists, as in JSON decoded part"""
+    if isinstance(value, CompactRecord):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    return value
+
+
+def json_default(obj):
+    """default function for json.dump of compact components"""
+    if isinstance(obj, CompactRecord):
+        return obj.to_dict()
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError("Object of type " + type(obj).__name__ + " is not JSON serializable")
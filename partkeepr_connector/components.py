@@ -0,0 +1,45 @@
+from .snapshot import InventorySnapshot
+from .category_router import CategoryRouter
+from .compact_component import compact_component
+from .export import DEFAULT_EXPORT_FORMAT, export_filename, read_export
+
+
+def open_snapshot(config):
+    """Returns InventorySnapshot from [snapshot] location or None when snapshot is not configured"""
+    location = config.get("snapshot", "location", fallback="").replace('"', '')
+    return InventorySnapshot(location) if location else None
+
+
+def component_export_format(config):
+    return config.get("partkeepr", "export_format", fallback=DEFAULT_EXPORT_FORMAT)
+
+
+def read_components(config, component_type, parse_float=None, compact=True):
+    """Yields decoded parts of given component type (e.g. 'resistors') one by one, from inventory snapshot if one is
+    configured, otherwise from export file written by Partkeepr.get_components
+
+    :compact: yield parts as compact Component records instead of dicts
+    """
+    convert = compact_component if compact else (lambda decoded: decoded)
+    snapshot = open_snapshot(config)
+    if snapshot is None:
+        filename = export_filename(component_type, component_export_format(config))
+        for component in read_export(filename, parse_float=parse_float):
+            yield convert(component)
+        return
+    try:
+        router = CategoryRouter.from_config(config)
+        for category_path, decoded in snapshot.decoded_parts(parse_float=parse_float):
+            if router.route(category_path) == component_type:
+                if decoded is None:
+                    raise ValueError("Part of " + category_path + " category is not decoded in inventory snapshot, it "
+                                     "was synchronized by an older version, run sync to decode it")
+                # parts decoded before categoryPath was added to decoded parts
+                decoded.setdefault('categoryPath', category_path)
+                yield convert(decoded)
+    finally:
+        snapshot.close()
+
+
+def load_components(config, component_type, parse_float=None, compact=True):
+    return list(read_components(config, component_type, parse_float=parse_float, compact=compact))
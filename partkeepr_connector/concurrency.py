@@ -0,0 +1,34 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def ordered_map(function, iterable, workers=8, max_in_flight=None, executor=None):
+    """Concurrent version of map(), yields results in the same order as items of iterable.
+
+    At most max_in_flight items are submitted to the pool at once, so long iterables are neither fully queued nor
+    are their results buffered without limit when the first item is slow.
+
+    :workers: number of worker threads, ignored when executor is given
+    :max_in_flight: limit of submitted but not yet yielded items, defaults to twice the number of workers
+    :executor: concurrent.futures executor to use instead of a new thread pool
+    """
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+    max_in_flight = max(max_in_flight, 1)
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for item in iterable:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # generator closed early or an item failed, don't run the items nobody will read
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=True)
@@ -0,0 +1,96 @@
+import gzip
+import json
+from decimal import Decimal
+
+# export format name -> file name extension
+EXPORT_FORMATS = {'ndjson': '.ndjson', 'ndjson.gz': '.ndjson.gz', 'json': '.json'}
+DEFAULT_EXPORT_FORMAT = 'ndjson'
+
+
+class DecimalEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return str(obj)
+        return super(DecimalEncoder, self).default(obj)
+
+
+class JsonArrayWriter:
+    """Writes JSON array into file element by element.
+
+    Output is the same as json.dump(elements, file, indent=4, sort_keys=True) but elements don't have to be kept in
+    memory until whole array is known. Pretty printed output is several times bigger than the data, it is meant for
+    debugging.
+    """
+
+    def __init__(self, filename, cls=None):
+        self.file = open(filename, 'w')
+        self.cls = cls
+        self.count = 0
+
+    def write(self, element):
+        encoded = json.dumps(element, sort_keys=True, indent=4, cls=self.cls)
+        self.file.write(('[\n    ' if self.count == 0 else ',\n    ') + encoded.replace('\n', '\n    '))
+        self.count += 1
+
+    def close(self):
+        self.file.write('[]' if self.count == 0 else '\n]')
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class NdjsonWriter:
+    """Writes compact JSON, one element per line (NDJSON), gzip compressed when filename ends with .gz"""
+
+    def __init__(self, filename, cls=None):
+        if filename.endswith('.gz'):
+            self.file = gzip.open(filename, 'wt', encoding='utf-8', compresslevel=6)
+        else:
+            self.file = open(filename, 'w', encoding='utf-8')
+        self.encoder = (cls or json.JSONEncoder)(separators=(',', ':'), ensure_ascii=False)
+        self.count = 0
+
+    def write(self, element):
+        self.file.write(self.encoder.encode(element))
+        self.file.write('\n')
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def export_filename(name, export_format):
+    return name + EXPORT_FORMATS[export_format]
+
+
+def export_writer(name, export_format, cls=None):
+    """Returns writer of `name` export file in given format ('ndjson', 'ndjson.gz' or pretty 'json')"""
+    filename = export_filename(name, export_format)
+    if export_format == 'json':
+        return JsonArrayWriter(filename, cls=cls)
+    return NdjsonWriter(filename, cls=cls)
+
+
+def read_export(filename, parse_float=None):
+    """Yields elements of a file written by export_writer, NDJSON files are read line by line"""
+    if filename.endswith('.json'):
+        with open(filename) as file:
+            for element in json.load(file, parse_float=parse_float):
+                yield element
+        return
+    opener = gzip.open if filename.endswith('.gz') else open
+    decoder = json.JSONDecoder(parse_float=parse_float)
+    with opener(filename, 'rt', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield decoder.decode(line)
@@ -0,0 +1,214 @@
+import bisect
+import os
+import re
+import threading
+from collections import OrderedDict
+
+# request latency histogram buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+id_in_path = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint(url):
+    """Endpoint label of API url, ids and query are dropped so calls of the same endpoint are counted together:
+    '/api/parts/123?itemsPerPage=9999' -> '/api/parts/{id}'"""
+    return id_in_path.sub('/{id}', url.split('?', 1)[0])
+
+
+class Metric:
+    """Base of metrics with values per label set, labels are given as keyword arguments"""
+    type = None
+
+    def __init__(self, name, help, label_names):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.values = OrderedDict()
+        self.lock = threading.Lock()
+
+    def key(self, labels):
+        return tuple(str(labels[label]) for label in self.label_names)
+
+    def format_labels(self, key, extra=None):
+        pairs = list(zip(self.label_names, key)) + ([extra] if extra is not None else [])
+        if not pairs:
+            return ''
+        return '{' + ','.join(name + '="' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+                              for name, value in pairs) + '}'
+
+    def prometheus_lines(self):
+        yield '# HELP ' + self.name + ' ' + self.help
+        yield '# TYPE ' + self.name + ' ' + self.type
+        with self.lock:
+            items = list(self.values.items())
+        for key, value in items:
+            yield self.name + self.format_labels(key) + ' ' + format_number(value)
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = value
+
+
+class HistogramValue:
+    def __init__(self, buckets):
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, help, label_names, buckets=LATENCY_BUCKETS):
+        super(Histogram, self).__init__(name, help, label_names)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self.key(labels)
+        with self.lock:
+            histogram = self.values.get(key)
+            if histogram is None:
+                histogram = self.values[key] = HistogramValue(self.buckets)
+            histogram.counts[bisect.bisect_left(self.buckets, value)] += 1
+            histogram.count += 1
+            histogram.sum += value
+            histogram.max = max(histogram.max, value)
+
+    def quantile(self, key, fraction):
+        """Upper bound of the bucket holding given fraction of observations, maximum for the last bucket"""
+        histogram = self.values[key]
+        rank = fraction * histogram.count
+        cumulative = 0
+        for bucket, count in zip(self.buckets, histogram.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bucket, histogram.max)
+        return histogram.max
+
+    def prometheus_lines(self):
+        yield '# HELP ' + self.name + ' ' + self.help
+        yield '# TYPE ' + self.name + ' ' + self.type
+        with self.lock:
+            items = [(key, list(value.counts), value.count, value.sum) for key, value in self.values.items()]
+        for key, counts, count, total in items:
+            cumulative = 0
+            for bucket, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield self.name + '_bucket' + self.format_labels(key, ('le', format_number(bucket))) + ' ' + \
+                      str(cumulative)
+            yield self.name + '_bucket' + self.format_labels(key, ('le', '+Inf')) + ' ' + str(count)
+            yield self.name + '_sum' + self.format_labels(key) + ' ' + format_number(total)
+            yield self.name + '_count' + self.format_labels(key) + ' ' + str(count)
+
+
+def format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Metrics of Partkeepr API calls made by the process.
+
+    Per endpoint request counts (by status), retries, connection errors, request and response bytes, latency
+    histograms and the number of requests in flight. Metrics can be printed as a summary or written as Prometheus
+    text format file, e.g. for node exporter textfile collector.
+    """
+
+    def __init__(self):
+        self.requests = Counter('partkeepr_requests_total', 'Partkeepr API responses by status code',
+                                ['method', 'endpoint', 'status'])
+        self.errors = Counter('partkeepr_request_errors_total', 'Partkeepr API requests without response',
+                              ['method', 'endpoint'])
+        self.retries = Counter('partkeepr_request_retries_total', 'Retried Partkeepr API requests',
+                               ['method', 'endpoint'])
+        self.request_bytes = Counter('partkeepr_request_bytes_total', 'Bytes of request bodies sent',
+                                     ['method', 'endpoint'])
+        self.response_bytes = Counter('partkeepr_response_bytes_total', 'Bytes of (decompressed) response bodies',
+                                      ['method', 'endpoint'])
+        self.latency = Histogram('partkeepr_request_duration_seconds', 'Partkeepr API request latency',
+                                 ['method', 'endpoint'])
+        self.in_flight = Gauge('partkeepr_requests_in_flight', 'Partkeepr API requests in progress', [])
+        self.metrics = [self.requests, self.errors, self.retries, self.request_bytes, self.response_bytes,
+                        self.latency, self.in_flight]
+
+    def record_response(self, method, url, response, duration, stream=False):
+        """:stream: body of the response is not read yet, its Content-Length is counted instead"""
+        labels = {'method': method.upper(), 'endpoint': endpoint(url)}
+        self.requests.inc(status=response.status_code, **labels)
+        self.latency.observe(duration, **labels)
+        body = response.request.body if response.request is not None else None
+        self.request_bytes.inc(len(body) if body is not None else 0, **labels)
+        if stream:
+            self.response_bytes.inc(int(response.headers.get('Content-Length', 0)), **labels)
+        else:
+            self.response_bytes.inc(len(response.content), **labels)
+
+    def record_error(self, method, url, duration):
+        labels = {'method': method.upper(), 'endpoint': endpoint(url)}
+        self.errors.inc(**labels)
+        self.latency.observe(duration, **labels)
+
+    def record_retry(self, method, url):
+        self.retries.inc(method=method.upper(), endpoint=endpoint(url))
+
+    def empty(self):
+        return len(self.latency.values) == 0
+
+    def print_summary(self):
+        if self.empty():
+            return
+        print("Partkeepr API calls:")
+        for key, histogram in list(self.latency.values.items()):
+            method, url = key
+            statuses = ", ".join(status + ": " + str(count) for (m, e, status), count in self.requests.values.items()
+                                 if (m, e) == key)
+            errors = self.errors.values.get(key, 0)
+            retries = self.retries.values.get(key, 0)
+            print("\t{} {}: {} calls ({}{}{}), {:.1f} kB sent, {:.1f} kB received, mean {:.1f}ms, p50 <= {:.1f}ms, "
+                  "p99 <= {:.1f}ms, max {:.1f}ms".format(
+                      method, url, histogram.count, statuses, ", no response: " + str(errors) if errors else "",
+                      ", retried: " + str(retries) if retries else "", self.request_bytes.values.get(key, 0) / 1024,
+                      self.response_bytes.values.get(key, 0) / 1024, histogram.sum / histogram.count * 1000,
+                      self.latency.quantile(key, 0.5) * 1000, self.latency.quantile(key, 0.99) * 1000,
+                      histogram.max * 1000))
+
+    def prometheus_text(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.prometheus_lines())
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, filename):
+        """Write metrics in Prometheus text format. File is replaced atomically, so a collector never reads it
+        half written."""
+        temporary = filename + '.' + str(os.getpid()) + '.tmp'
+        with open(temporary, 'w') as file:
+            file.write(self.prometheus_text())
+        os.replace(temporary, filename)
+
+
+# metrics of all sessions of the process
+default_registry = MetricsRegistry()
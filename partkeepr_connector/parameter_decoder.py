@@ -0,0 +1,64 @@
+from decimal import Decimal
+
+# (base, exponent) -> Decimal multiplier of SI prefix, filled from units registry and on first use of unknown prefix
+prefix_multipliers = {}
+
+
+def prefix_multiplier(prefix):
+    key = (prefix["base"], prefix["exponent"])
+    multiplier = prefix_multipliers.get(key)
+    if multiplier is None:
+        multiplier = Decimal(prefix["base"]) ** Decimal(prefix["exponent"])
+        prefix_multipliers[key] = multiplier
+    return multiplier
+
+
+def register_prefixes(units):
+    """Precompute multipliers of all prefixes of the units"""
+    for unit in units:
+        for prefix in unit['prefixes']:
+            prefix_multiplier(prefix)
+
+
+def to_decimal(value):
+    if value is None:
+        return None
+    if type(value) is int:
+        return Decimal(value)
+    return Decimal(str(value))
+
+
+def scaled_value(value, prefix):
+    value = to_decimal(value)
+    if value is None or prefix is None:
+        return value
+    return value * prefix_multiplier(prefix)
+
+
+def decode_parameter(parameter):
+    """Decode Partkeepr part parameter, numeric values are returned as Decimal in base unit (without SI prefix)"""
+    if parameter["valueType"] == "string":
+        return {"value": parameter["stringValue"]}
+    elif parameter["valueType"] == "numeric":
+        if parameter["unit"] is not None:
+            return {"value": scaled_value(parameter["value"], parameter["siPrefix"]),
+                    "valueMin": scaled_value(parameter["minValue"], parameter["minSiPrefix"]),
+                    "valueMax": scaled_value(parameter["maxValue"], parameter["maxSiPrefix"]),
+                    "unit": parameter["unit"]["name"]}
+        return {"value": to_decimal(parameter["value"]),
+                "valueMax": to_decimal(parameter["maxValue"]),
+                "valueMin": to_decimal(parameter["minValue"])}
+    raise ValueError("Unsupported parameter value type: " + str(parameter["valueType"]))
+
+
+def decode_parameters(parameters):
+    """Decode list of part parameters into dict keyed by parameter name"""
+    decoded = {}
+    for parameter in parameters:
+        decoded[parameter["name"]] = decode_parameter(parameter)
+    return decoded
+
+
+def decode_parts_parameters(parts):
+    """Decode parameters of all parts in one pass, returns list of decoded parameters dicts in parts order"""
+    return [decode_parameters(part["parameters"]) for part in parts]
@@ -1,10 +1,5 @@
 from .partkeepr_units import Units as PartkeeprUnits
-import sys
-
-sys.path.insert(1, "third_party/partname-resolver")
-
-from partname_resolver.units.unit_base import Unit
-from partname_resolver.units.range_base import RangeBase
+from .third_party import add_partname_resolver_path
 
 
 class Part:
@@ -26,8 +21,24 @@ class Part:
 
     def __init__(self, id, request, units):
         self.id = id
-        self.request = request
+        self.__request = request
         self.units = units
+        # parameters added by add_parameter and not yet moved to request, in order of addition
+        self.__added_parameters = []
+        self.__parameters_index = {}
+        for parameter in request['parameters']:
+            self.__parameters_index.setdefault(parameter['name'], parameter)
+
+    @property
+    def request(self):
+        """Put request of the part. Parameters added by add_parameter are at the beginning of the parameter list,
+        the most recently added first. Parameters are indexed by name for get_parameter_by_name and
+        has_parameter_named, add and remove them with add_parameter and remove_parameter, changes made directly to
+        request['parameters'] are not seen by the index."""
+        if len(self.__added_parameters) > 0:
+            self.__request['parameters'][:0] = reversed(self.__added_parameters)
+            self.__added_parameters = []
+        return self.__request
 
     def get_id(self):
         return self.id
@@ -66,6 +77,10 @@ class Part:
         def decimal_to_int_or_float(parameter_value):
             return int(parameter_value) if float(parameter_value).is_integer() else float(parameter_value)
 
+        add_partname_resolver_path()
+        from partname_resolver.units.unit_base import Unit
+        from partname_resolver.units.range_base import RangeBase
+
         value_to_si_prefix = {'value': 'siPrefix', 'minValue': 'minSiPrefix', 'maxValue': 'maxSiPrefix'}
         if self.has_parameter(name) is False:
             parameter = dict(Part.parameter_template)
@@ -95,11 +110,12 @@ class Part:
                     if unit is None:
                         raise ValueError
                     parameter["unit"] = unit
-                    min_prefix = value.min.get_closest_prefix(self.units.get_supported_prefixes(unit)['names'])
+                    names = self.units.get_supported_prefixes(unit)['names']
+                    min_prefix = value.min.get_closest_prefix(names)
                     parameter['minValue'] = decimal_to_int_or_float(value.min.get_value_as(min_prefix))
                     parameter['minSiPrefix'] = self.units.get_prefix(unit, min_prefix)
 
-                    max_prefix = value.max.get_closest_prefix(self.units.get_supported_prefixes(unit)['names'])
+                    max_prefix = value.max.get_closest_prefix(names)
                     parameter['maxValue'] = decimal_to_int_or_float(value.max.get_value_as(max_prefix))
                     parameter['maxSiPrefix'] = self.units.get_prefix(unit, max_prefix)
                 else:
@@ -107,17 +123,41 @@ class Part:
                     parameter['maxValue'] = decimal_to_int_or_float(max)
             else:
                 raise TypeError
-            self.request['parameters'].insert(0, parameter)
+            self.__added_parameters.append(parameter)
+            self.__parameters_index[name] = parameter
             return True
         return False
 
     def get_parameter(self, name):
+        """Returns first parameter which name contains name or None, see get_parameter_by_name for exact match"""
         for parameter in self.request['parameters']:
             if name in parameter['name']:
                 return parameter
 
     def has_parameter(self, parameter_name):
-        for parameter in self.request['parameters']:
-            if parameter_name in parameter['name']:
-                return True
-        return False
+        """True when any parameter name contains parameter_name, e.g. 'Voltage' matches 'Rated Voltage'. A miss scans
+        all parameter names, use has_parameter_named when the exact name is known."""
+        if parameter_name in self.__parameters_index:
+            return True
+        return any(parameter_name in name for name in self.__parameters_index)
+
+    def get_parameter_by_name(self, name):
+        """Returns first parameter with exactly the given name or None"""
+        return self.__parameters_index.get(name)
+
+    def has_parameter_named(self, name):
+        """True when a parameter has exactly the given name"""
+        return name in self.__parameters_index
+
+    def find_parameters(self, text):
+        """Returns all parameters which name contains text"""
+        return [parameter for parameter in self.request['parameters'] if text in parameter['name']]
+
+    def remove_parameter(self, name):
+        """Removes all parameters with the given name, returns number of removed parameters"""
+        parameters = self.request['parameters']
+        remaining = [parameter for parameter in parameters if parameter['name'] != name]
+        removed = len(parameters) - len(remaining)
+        parameters[:] = remaining
+        self.__parameters_index.pop(name, None)
+        return removed
@@ -1,203 +1,125 @@
-from .part import Part
-from decimal import Decimal
-import json
-import sys
+from .parameter_decoder import decode_parameter
+from .third_party import add_partname_resolver_path
 
-sys.path.insert(1, "third_party/partname-resolver")
-from partname_resolver.components.resistor import Resistor
+add_partname_resolver_path()
 from partname_resolver.components.inductor import Inductor
 from partname_resolver.units.resistance import Resistance #, ResistanceRange todo will be needed for potentiometers
-from partname_resolver.units.resistanceTolerance import Tolerance as ResistanceTolerance
 from partname_resolver.units.inductance import Inductance
 from partname_resolver.units.resistanceTolerance import Tolerance as InductanceTolerance
 from partname_resolver.units.current import Current
 from partname_resolver.units.temperature import TemperatureRange
 
 
-def working_voltage_parameter_to_unit(part):
-    voltage = part.get_parameter('voltage')
-    return None
+class PartRecord:
+    """Parameters of a part decoded in a single pass over the parameter list.
 
+    Decoded numeric and string parameters are kept in separate dicts keyed by parameter name, when a part has more
+    parameters with the same name and value type the first one is used.
+    """
 
-def resistance_tolerance_from_from_part(part):
-    """Convert partkeepr part tolerance parameter to Tolerance object"""
-    for parameter in part.request['parameters']:
-        if parameter["valueType"] == "numeric" and parameter['name'] == 'Tolerance':
-            decoded = decode_parameter(parameter)
-            if 'unit' in decoded and decoded["unit"] == 'Ohm':
-                if decoded['value'] is not None:
-                    return ResistanceTolerance(decoded["value"])
-                else:
-                    return ResistanceTolerance(decoded["valueMin"], decoded["valueMax"])
+    def __init__(self, parameters):
+        self.numeric_parameters = {}
+        self.string_parameters = {}
+        for parameter in parameters:
+            if parameter["valueType"] == "numeric":
+                parameters_of_type = self.numeric_parameters
+            elif parameter["valueType"] == "string":
+                parameters_of_type = self.string_parameters
             else:
-                if decoded['value'] is not None:
-                    return ResistanceTolerance(str(decoded['value']) + "%")
-                else:
-                    return ResistanceTolerance(str(decoded["valueMin"]) + "%", "+" + str(decoded["valueMax"]) + "%")
+                continue
+            if parameter['name'] not in parameters_of_type:
+                parameters_of_type[parameter['name']] = decode_parameter(parameter)
+
+    @classmethod
+    def from_part(cls, part):
+        return cls(part.request['parameters'])
+
+    def numeric(self, name):
+        """Returns decoded numeric parameter (dict with value, valueMin, valueMax and unit) or None"""
+        return self.numeric_parameters.get(name)
+
+    def numeric_value(self, name, field='value'):
+        decoded = self.numeric_parameters.get(name)
+        return decoded[field] if decoded is not None else None
 
+    def string(self, name):
+        decoded = self.string_parameters.get(name)
+        return decoded['value'] if decoded is not None else None
+
+
+def manufacturer_from_part(part):
+    """Returns (manufacturer name, manufacturer part number), part name is used as part number of parts without
+    manufacturer"""
+    if len(part.get_manufacturers()) > 1:
+        raise ValueError("Part has more than one manufacturer")
+    if len(part.get_manufacturers()) == 0:
+        return None, part.get_name()
+    manufacturer = part.get_manufacturers()[0]
+    name = manufacturer['manufacturer']['name'] if 'name' in manufacturer['manufacturer'] else None
+    return name, manufacturer['partNumber']
 
-def inductance_tolerance_from_from_part(part):
+
+def footprint_from_part(part):
+    return part.get_footprint()['name'] if part.get_footprint() is not None else None
+
+
+def inductance_tolerance_from_record(record):
     """Convert partkeepr part tolerance parameter to Tolerance object"""
-    for parameter in part.request['parameters']:
-        if parameter["valueType"] == "numeric" and parameter['name'] == 'Tolerance':
-            decoded = decode_parameter(parameter)
-            if 'unit' in decoded and decoded["unit"] == 'Henry':
-                if decoded['value'] is not None:
-                    return InductanceTolerance(decoded["value"])
-                else:
-                    return InductanceTolerance(decoded["valueMin"], decoded["valueMax"])
-            else:
-                if decoded['value'] is not None:
-                    return InductanceTolerance(str(decoded['value']) + "%")
-                else:
-                    return InductanceTolerance(str(decoded["valueMin"]) + "%", "+" + str(decoded["valueMax"]) + "%")
+    decoded = record.numeric('Tolerance')
+    if decoded is None:
+        return None
+    if 'unit' in decoded and decoded["unit"] == 'Henry':
+        if decoded['value'] is not None:
+            return InductanceTolerance(decoded["value"])
+        else:
+            return InductanceTolerance(decoded["valueMin"], decoded["valueMax"])
+    else:
+        if decoded['value'] is not None:
+            return InductanceTolerance(str(decoded['value']) + "%")
+        else:
+            return InductanceTolerance(str(decoded["valueMin"]) + "%", "+" + str(decoded["valueMax"]) + "%")
 
 
-def power_parameter_to_unit(part):
-    return None
+def working_temperature_range_from_record(record):
+    decoded = record.numeric('Working Temperature')
+    if decoded is not None:
+        return TemperatureRange(decoded['valueMin'], decoded['valueMax'])
 
 
-def working_temperature_range_from_part(part):
-    for parameter in part.request['parameters']:
-        if parameter["valueType"] == "numeric":
-            if 'Working Temperature' == parameter['name']:
-                decoded = decode_parameter(parameter)
-                return TemperatureRange(decoded['valueMin'], decoded['valueMax'])
+def resistance_from_record(record):
+    value = record.numeric_value("Resistance")
+    return Resistance(value) if value is not None else None
 
 
-def resistance_paremeter_to_unit(part):
-    return None
+def inductance_from_record(record):
+    value = record.numeric_value("Inductance")
+    return Inductance(value) if value is not None else None
 
 
-def inductance_from_part(part):
-    for parameter in part.request['parameters']:
-        if parameter["valueType"] == "numeric" and parameter['name'] == "Capacitance":
-            decoded = decode_parameter(parameter)
-            if decoded is not None:
-                return Inductance(decoded['value'])
-            else:
-                return InductanceRange(decoded["valueMin"], decoded["valueMax"])
-
-
-def quality_from_part(part):
-    for parameter in part.request['parameters']:
-        if parameter["valueType"] == "numeric" and parameter['name'] == "Q":
-            decoded = decode_parameter(parameter)
-            if decoded is not None:
-                return decoded['value']
-            #else:
-            #    return InductanceRange(decoded["valueMin"], decoded["valueMax"])
-
-
-def rated_current_from_part(part):
-    for parameter in part.request['parameters']:
-        if parameter["valueType"] == "numeric" and parameter['name'] == "Rated Current":
-            decoded = decode_parameter(parameter)
-            if decoded is not None:
-                return Current(decoded['value'])
-            #else:
-            #    return InductanceRange(decoded["valueMin"], decoded["valueMax"])
-
-
-def inductor_type_from_part(part):
-    for parameter in part.request['parameters']:
-        if parameter["valueType"] == "string" and parameter['name'] == "Part Type":
-            decoded = decode_parameter(parameter)
-            if decoded is not None:
-                return Inductor.Type(decoded['value'])
-
-
-def SRF_current_from_part(part):
-    for parameter in part.request['parameters']:
-        if parameter["valueType"] == "numeric" and parameter['name'] == "Self Resonant Frequency":
-            decoded = decode_parameter(parameter)
-            if decoded is not None:
-                return decoded['value']
-            #else:
-            #    return InductanceRange(decoded["valueMin"], decoded["valueMax"])
-
-
-def voltage_max_from_part(part):
-    for parameter in part.request['parameters']:
-        if parameter["valueType"] == "numeric" and parameter['name'] == "Voltage":
-            decoded = decode_parameter(parameter)
-            if decoded is not None:
-                return decoded['valueMax']
-            #else:
-            #    return InductanceRange(decoded["valueMin"], decoded["valueMax"])
-
-
-def resistance_from_part(part):
-    for parameter in part.request['parameters']:
-        if parameter["valueType"] == "numeric" and parameter['name'] == "Resistance":
-            decoded = decode_parameter(parameter)
-            if decoded is not None:
-                return Resistance(decoded['value'])
-            else:
-                return ResistanceRange(decoded["valueMin"], decoded["valueMax"])
+def rated_current_from_record(record):
+    value = record.numeric_value("Rated Current")
+    return Current(value) if value is not None else None
 
-def to_resistor(part):
-    return Resistor(resistor_type=None,
-                    manufacturer=part.get_manufacturer_name(),
-                    partnumber=part.get_manufacturer_part_number(),
-                    working_temperature_range=temperature_range_to_unit(part),
-                    series=None,
-                    resistance=resistance_paremeter_to_unit(part),
-                    power=power_parameter_to_unit(part),
-                    max_working_voltage=working_voltage_parameter_to_unit(part),
-                    tolerance=None,
-                    case=part.get_footprint(),
-                    note=part.get_comment())
 
+def inductor_type_from_record(record):
+    part_type = record.string("Part Type")
+    return Inductor.Type(part_type) if part_type is not None else None
 
-def part_to_inductor(part):
-    if len(part.get_manufacturers()) > 1:
-        raise ValueError("Part has more than one manufacturer")
-    manufacturer = part.get_manufacturers()[0] if len(part.get_manufacturers()) == 1 else None
 
-    return Inductor(inductor_type=inductor_type_from_part(part),
-                    manufacturer=manufacturer['manufacturer']['name'] if 'name' in manufacturer['manufacturer'] else None,
-                    partnumber=manufacturer['partNumber'],
-                    working_temperature_range=working_temperature_range_from_part(part),
+def part_to_inductor(part):
+    record = PartRecord.from_part(part)
+    manufacturer, partnumber = manufacturer_from_part(part)
+    return Inductor(inductor_type=inductor_type_from_record(record),
+                    manufacturer=manufacturer,
+                    partnumber=partnumber,
+                    working_temperature_range=working_temperature_range_from_record(record),
                     series=None,
-                    inductance=inductance_from_part(part),
-                    tolerance=inductance_tolerance_from_from_part(part),
-                    q=quality_from_part(part),
-                    dc_resistance=resistance_from_part(part),
-                    rated_current=rated_current_from_part(part),
-                    self_resonant_frequency=SRF_current_from_part(part),
-                    max_working_voltage=voltage_max_from_part(part),
-                    case=part.get_footprint()['name'] if part.get_footprint() is not None else None,
+                    inductance=inductance_from_record(record),
+                    tolerance=inductance_tolerance_from_record(record),
+                    q=record.numeric_value("Q"),
+                    dc_resistance=resistance_from_record(record),
+                    rated_current=rated_current_from_record(record),
+                    self_resonant_frequency=record.numeric_value("Self Resonant Frequency"),
+                    max_working_voltage=record.numeric_value("Voltage", 'valueMax'),
+                    case=footprint_from_part(part),
                     note=part.get_comment())
-
-
-def decode_parameter(parameter):
-    if parameter["valueType"] == "string":
-        decoded = {"value": parameter["stringValue"]}
-    elif parameter["valueType"] == "numeric":
-        if parameter["unit"] is not None:
-            if parameter["maxSiPrefix"] is not None:
-                maxValue = Decimal(str(parameter["maxValue"])) * Decimal(
-                    parameter["maxSiPrefix"]["base"]) ** Decimal(parameter["maxSiPrefix"]["exponent"])
-            else:
-                maxValue = Decimal(str(parameter["maxValue"])) if parameter["maxValue"] is not None else None
-            if parameter["minSiPrefix"] is not None:
-                minValue = Decimal(str(parameter["minValue"])) * Decimal(
-                    parameter["minSiPrefix"]["base"]) ** Decimal(parameter["minSiPrefix"]["exponent"])
-            else:
-                minValue = Decimal(str(parameter["minValue"])) if parameter["minValue"] is not None else None
-            if parameter["siPrefix"] is not None:
-                value = Decimal(str(parameter["value"])) * Decimal(parameter["siPrefix"]["base"]) ** Decimal(
-                    parameter["siPrefix"]["exponent"])
-            else:
-                value = Decimal(str(parameter["value"])) if parameter["value"] is not None else None
-            decoded = {"value": value, "valueMin": minValue, "valueMax": maxValue,
-                                          "unit": parameter["unit"]["name"]}
-        else:
-            value = Decimal(str(parameter["value"])) if parameter["value"] is not None else None
-            maxValue = Decimal(str(parameter["maxValue"])) if parameter["maxValue"] is not None else None
-            minValue = Decimal(str(parameter["minValue"])) if parameter["minValue"] is not None else None
-            decoded = {"value": value, "valueMax": maxValue, "valueMin": minValue}
-    else:
-        raise
-    return decoded
@@ -1,18 +1,23 @@
-import requests
-from requests.auth import HTTPBasicAuth
-import sys
 import json
-from decimal import Decimal
+import threading
 import time
+from contextlib import ExitStack, contextmanager
 from .part import Part
+from .parameter_decoder import decode_parameters
 from .partkeepr_units import Units
+from .session import PartkeeprSession, PartkeeprApiError
+from .export import export_writer, DecimalEncoder
+from .change_set import ChangeSet
+from .components import component_export_format, open_snapshot
+from .attachments import open_attachment_mirror, collect_attachments
+from .category_router import CategoryRouter
+from . import profiling
 
 
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return str(obj)
-        return super(DecimalEncoder, self).default(obj)
+# Units fetched from server are shared by all Partkeepr instances of the process, keyed by server url
+units_registry = {}
+# held while units are loaded, so threads asking for units of the same server at once download them only once
+units_registry_lock = threading.Lock()
 
 
 class Partkeepr:
@@ -22,35 +27,78 @@ class Partkeepr:
         self.noEdit = noEdit
         timestr = time.strftime("%Y_%m_%d-%H_%M_%S")
         self.log = open("partkeepr_" + timestr + ".log", 'w')
-
-    def __del__(self):
+        self.session = PartkeeprSession.from_config(config)
+        self.snapshot = open_snapshot(config)
+        self.attachment_mirror = open_attachment_mirror(config)
+        self.change_set = None
+
+    def close(self):
+        self.session.close()
+        if self.snapshot is not None:
+            self.snapshot.close()
+        if self.attachment_mirror is not None:
+            self.attachment_mirror.close()
         self.log.close()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def get_part(self, part_id):
         params = {"itemsPerPage": 9999}
         response = self.api_call('get', '/api/parts/' + part_id, params=params)
         request = self.__convert_part_response_to_put_request(response.json())
-        return Part(part_id, request, self.__get_units())
+        return Part(part_id, request, self.get_units())
 
-    def update_part(self, part):
+    def update_part(self, part, verbose=True):
         id = part.get_id()
-        print("Updating part:", id)
-        r = self.api_call('put', '/api/parts/' + id, json=part.request)
-        r.raise_for_status()
-        return r
+        if verbose:
+            print("Updating part:", id)
+        return self.api_call('put', '/api/parts/' + id, json=part.request)
+
+    @contextmanager
+    def changes(self, from_snapshot=False):
+        """Collect edit_part_description and edit_part_parameter calls made inside the block and send them on exit,
+        with a single GET and PUT per part. Nested blocks are merged into the outermost one.
+
+        :from_snapshot: apply edits on the copy of the part from inventory snapshot instead of fetching it
+        """
+        if self.change_set is not None:
+            yield self.change_set
+            return
+        self.change_set = ChangeSet(self, from_snapshot=from_snapshot)
+        try:
+            yield self.change_set
+            self.change_set.flush()
+            if len(self.change_set.failed) > 0:
+                print("Failed to update", len(self.change_set.failed), "parts:")
+                for part_id, error in self.change_set.failed.items():
+                    print("\t" + part_id + ":", error)
+        finally:
+            self.change_set = None
+
+    def __edit(self, part_id, edit):
+        if self.change_set is not None:
+            self.change_set.add(part_id, edit)
+        else:
+            change_set = ChangeSet(self)
+            change_set.add(part_id, edit)
+            change_set.flush()
+            # single edit fails loudly, only batched edits are collected into `failed`
+            if part_id in change_set.failed:
+                raise change_set.failed[part_id]
 
     def edit_part_description(self, part_id, description):
+        def update_description(request):
+            self.log.write("Updating description of part: " + part_id + ", old description: " +
+                           request['description'] + ", new description: " + description + "\n")
+            request['description'] = description
+
         if part_id.startswith("/api/parts/"):
             part_id = part_id.replace("/api/parts/", "")
-            response = self.get_component(part_id)
-            old_description = response['description']
-            self.log.write("Updating description of part: " + part_id + ", old description: " + old_description +
-                           ", new description: " + description + "\n")
-            request = self.__convert_part_response_to_put_request(response)
-            request['description'] = description
-            r = self.api_call('put', '/api/parts/' + part_id, json=request)
-            r.raise_for_status()
-            return r
+            self.__edit(part_id, update_description)
 
     def edit_part_parameter(self, part_id, parameter_name, value):
         def update_value(parameter, value):
@@ -65,23 +113,17 @@ class Partkeepr:
                         parameter[si_prefix_map[value_type]] = None
                 return parameter
 
+        def update_parameter(request):
+            found = [parameter for parameter in request['parameters'] if parameter['name'] == parameter_name]
+            if len(found) == 1 and found[0]["valueType"] == "numeric":
+                old_parameter = str(found[0])
+                new_parameter = update_value(found[0], value)
+                self.log.write("Updating " + parameter_name + " parameter of part: " + part_id +
+                               ", old parameter: " + old_parameter + ", new parameter: " + str(new_parameter) + "\n")
+
         if part_id.startswith("/api/parts/"):
             part_id = part_id.replace("/api/parts/", "")
-            response = self.get_component(part_id)
-            request = self.__convert_part_response_to_put_request(response)
-            found = 0
-            for parameter in request['parameters']:
-                if parameter['name'] == parameter_name:
-                    found += 1
-                    old_parameter = parameter
-            if found == 1:
-                new_parameter = update_value(old_parameter, value)
-                if old_parameter["valueType"] == "numeric":
-                    self.log.write("Updating " + parameter_name + " parameter of part: " + part_id +
-                                   ", old parameter: " + str(old_parameter) + ", new parameter: " + str(
-                        new_parameter) + "\n")
-                    r = self.api_call('put', '/api/parts/' + part_id, json=request)
-                    r.raise_for_status()
+            self.__edit(part_id, update_parameter)
 
     def find_part_parameter(self, name):
         r = self.api_call('get', '/api/parts/getPartParameterNames')
@@ -97,11 +139,34 @@ class Partkeepr:
             response = self.get_component(part_id)
             return self.__convert_part_response_to_put_request(response)
 
+    def get_snapshot_component_request(self, part_id):
+        """Returns put request made from inventory snapshot copy of the part, None if the part is not in snapshot"""
+        if self.snapshot is not None:
+            part = self.snapshot.get_part("/api/parts/" + part_id)
+            if part is not None:
+                return self.__convert_part_response_to_put_request(part)
+
     def get_unit(self, name):
-        units = self.__get_units()
+        units = self.get_units()
         return units.get(name)
 
-    def __get_units(self):
+    def get_units(self):
+        """Returns units registry, downloaded once per process or loaded from [partkeepr] units_cache file if it is
+        younger than units_cache_ttl seconds"""
+        url = self.config["partkeepr"]["url"]
+        with units_registry_lock:
+            if url not in units_registry:
+                cache_file = self.config["partkeepr"].get("units_cache", "")
+                ttl = self.config["partkeepr"].getfloat("units_cache_ttl", 86400)
+                units = Units.from_cache_file(cache_file, ttl) if cache_file else None
+                if units is None:
+                    units = self.__download_units()
+                    if cache_file:
+                        units.save(cache_file)
+                units_registry[url] = units
+            return units_registry[url]
+
+    def __download_units(self):
         params = {"itemsPerPage": 9999}
         r = self.api_call('get', '/api/units', params=params)
         rj = r.json()
@@ -113,28 +178,17 @@ class Partkeepr:
         :method: requst method
         :url: part of the url to call (without base)
         :data: tata to pass to the request if any
+        :timeout: optional timeout of this call, overrides session default
         :returns: requests object
+        :raises PartkeeprApiError: when the call failed after all retries
 
         """
 
         if self.noEdit and method != 'get':
             return
-        pk_user = self.config["partkeepr"]["user"]
-        pk_pwd = self.config["partkeepr"]["pwd"]
-        pk_url = self.config["partkeepr"]["url"]
-        try:
-            r = requests.request(
-                method,
-                pk_url + url,
-                **kwargs,
-                auth=HTTPBasicAuth(pk_user, pk_pwd),
-                verify=False
-            )
-            r.raise_for_status()
-        except requests.exceptions.HTTPError as err:
-            print(err)
-            sys.exit(1)
-
+        r = self.session.request(method, url, **kwargs)
+        if r.status_code >= 400:
+            raise PartkeeprApiError.from_response(r, method, url)
         return r
 
     def decode_manufacturers(self, manufacturers):
@@ -155,38 +209,7 @@ class Partkeepr:
         return decoded
 
     def decode_parameters(self, parameters, partname):
-        decoded = {}
-        for parameter in parameters:
-            if parameter["valueType"] == "string":
-                decoded[parameter["name"]] = {"value": parameter["stringValue"]}
-            elif parameter["valueType"] == "numeric":
-                if parameter["unit"] is not None:
-                    if parameter["maxSiPrefix"] is not None:
-                        maxValue = Decimal(str(parameter["maxValue"])) * Decimal(
-                            parameter["maxSiPrefix"]["base"]) ** Decimal(parameter["maxSiPrefix"]["exponent"])
-                    else:
-                        maxValue = Decimal(str(parameter["maxValue"])) if parameter["maxValue"] is not None else None
-                    if parameter["minSiPrefix"] is not None:
-                        minValue = Decimal(str(parameter["minValue"])) * Decimal(
-                            parameter["minSiPrefix"]["base"]) ** Decimal(parameter["minSiPrefix"]["exponent"])
-                    else:
-                        minValue = Decimal(str(parameter["minValue"])) if parameter["minValue"] is not None else None
-                    if parameter["siPrefix"] is not None:
-                        value = Decimal(str(parameter["value"])) * Decimal(parameter["siPrefix"]["base"]) ** Decimal(
-                            parameter["siPrefix"]["exponent"])
-                    else:
-                        value = Decimal(str(parameter["value"])) if parameter["value"] is not None else None
-                    decoded[parameter["name"]] = {"value": value, "valueMin": minValue, "valueMax": maxValue,
-                                                  "unit": parameter["unit"]["name"]}
-                else:
-                    value = Decimal(str(parameter["value"])) if parameter["value"] is not None else None
-                    maxValue = Decimal(str(parameter["maxValue"])) if parameter["maxValue"] is not None else None
-                    minValue = Decimal(str(parameter["minValue"])) if parameter["minValue"] is not None else None
-                    decoded[parameter["name"]] = {"value": value, "valueMax": maxValue, "valueMin": minValue}
-                    print(parameter)
-            else:
-                raise
-        return decoded
+        return decode_parameters(parameters)
 
     def decode_part(self, part):
         try:
@@ -199,9 +222,8 @@ class Partkeepr:
                    "attachments": self.decode_attachments(part["attachments"]),
                    "comment": part["comment"], "footprint": footprint_name,
                    "manufacturers": self.decode_manufacturers(part["manufacturers"]),
-                   "productionRemarks": part["productionRemarks"], 'partkeepr_id': part['@id']}
-        if part['name'] == "CL10A475KP8NNNC":
-            print(decoded["parameters"])
+                   "productionRemarks": part["productionRemarks"], 'partkeepr_id': part['@id'],
+                   'categoryPath': part['categoryPath']}
         return decoded
 
     def get_component(self, id):
@@ -209,40 +231,100 @@ class Partkeepr:
         r = self.api_call('get', '/api/parts/' + id, params=params)
         return r.json()
 
-    def get_components(self):
-        params = {"itemsPerPage": 9999}
-        r = self.api_call('get', '/api/parts', params=params)
-        rj = r.json()
+    def iter_components(self, page_size=None):
+        """Yields parts from /api/parts page by page, following hydra next page links
 
-        with open('partkeepr.json', 'w') as outputfile:
-            json.dump(rj, outputfile, sort_keys=True, indent=4)
-
-        others = []
-
-        component_group = [[] for y in range(len(self.config["partkeepr component location"]))] 
-        for part in rj["hydra:member"]:
-            found = False
-            for i, key in enumerate(self.config["partkeepr component location"]):     
-                category = self.config["partkeepr component location"][key].replace('"', '')            
-                if part["categoryPath"].startswith(category):
-                    #print("Adding into", self.config["partkeepr component location"])
-                    component_group[i].append(self.decode_part(part))
-                    found = True
-                    break                
-
-            if found is False:
-                others.append(part)
- 
-        to_save = [{'filename': 'others.json', 'data': others}]
-        for i, component_type in enumerate(self.config["partkeepr component location"]):
-            to_save.append({'filename': str(component_type) + '.json', 'data': component_group[i]})
-        
-        for s in to_save:
-            with open(s['filename'], 'w') as outputfile:
-                json.dump(s['data'], outputfile, sort_keys=True, indent=4, cls=DecimalEncoder)
+        :page_size: parts per page, [partkeepr] page_size config value is used when None
+        """
+        if page_size is None:
+            page_size = self.config["partkeepr"].getint("page_size", 500)
+        url = '/api/parts?page=1'
+        while url is not None:
+            rj = self.api_call('get', url, params={"itemsPerPage": page_size}).json()
+            for part in rj["hydra:member"]:
+                yield part
+            next_url = self.__next_page(rj)
+            url = next_url if next_url != url else None
+
+    def __next_page(self, collection):
+        if "hydra:view" in collection:
+            next_url = collection["hydra:view"].get("hydra:next")
+        else:
+            next_url = collection.get("hydra:nextPage")
+        if next_url is not None and next_url.startswith(self.config["partkeepr"]["url"]):
+            next_url = next_url[len(self.config["partkeepr"]["url"]):]
+        return next_url
+
+    def sync_snapshot(self):
+        """Update local inventory snapshot, only parts changed since last sync are decoded and stored. Parts of all
+        categories are decoded, so a category added to [partkeepr component location] later needs no re-download.
+        Attachment mirror, if configured, is updated with attachments of the parts streamed for the snapshot."""
+        parts = self.iter_components()
+        attachments = {}
+        if self.attachment_mirror is not None:
+            parts = collect_attachments(parts, attachments)
+        stats = self.snapshot.sync(parts, self.decode_part, encoder=DecimalEncoder)
+        print("Snapshot synchronized, added:", stats['added'], "changed:", stats['changed'], "removed:",
+              stats['removed'], "unchanged:", stats['unchanged'])
+        if self.attachment_mirror is not None:
+            self.sync_attachments(attachments)
+        return stats
+
+    def sync_attachments(self, attachments=None):
+        """Download new and changed attachments into attachment mirror
+
+        :attachments: dict attachment @id -> (part @id, attachment) of all parts, collected from /api/parts when None
+        """
+        if attachments is None:
+            attachments = {}
+            for part in collect_attachments(self.iter_components(), attachments):
+                pass
+        workers = self.config.getint("attachments", "workers", fallback=8)
+        with profiling.stage('attachments'):
+            stats = self.attachment_mirror.sync(attachments, self.session, workers=workers)
+        print("Attachments synchronized, added:", stats['added'], "changed:", stats['changed'], "removed:",
+              stats['removed'], "unchanged:", stats['unchanged'], "failed:", stats['failed'],
+              "downloaded: {:.1f} MiB".format(stats['bytes'] / 1024 / 1024))
+        return stats
+
+    def get_components(self, export_format=None):
+        """Export all parts into partkeepr.<ext>, decoded parts of every configured component type into
+        <component type>.<ext> and remaining parts into others.<ext>.
+
+        :export_format: 'ndjson', 'ndjson.gz' or pretty printed 'json', [partkeepr] export_format config value is
+        used when None
+        """
+        if export_format is None:
+            export_format = component_export_format(self.config)
+        router = CategoryRouter.from_config(self.config)
+        if self.snapshot is not None:
+            with profiling.stage('sync'):
+                self.sync_snapshot()
+            parts = profiling.timed_iter(self.snapshot.parts(), 'fetch')
+        else:
+            parts = ((part, None) for part in profiling.timed_iter(self.iter_components(), 'fetch'))
+
+        with ExitStack() as stack:
+            raw = stack.enter_context(export_writer('partkeepr', export_format))
+            others = stack.enter_context(export_writer('others', export_format, cls=DecimalEncoder))
+            component_group = {key: stack.enter_context(export_writer(str(key), export_format, cls=DecimalEncoder))
+                               for key in router.component_types}
+            for part, decoded in parts:
+                with profiling.stage('write'):
+                    raw.write(part)
+                component_type = router.route(part["categoryPath"])
+                if component_type is not None:
+                    if decoded is None:
+                        with profiling.stage('decode', component_type):
+                            decoded = self.decode_part(part)
+                    with profiling.stage('write', component_type):
+                        component_group[component_type].write(decoded)
+                else:
+                    with profiling.stage('write', 'others'):
+                        others.write(part)
 
     def __convert_part_response_to_put_request(self, part):
-        part.pop('@context')
+        part.pop('@context', None)
         part.pop("@id")
         part.pop("averagePrice")
         part.pop("createDate")
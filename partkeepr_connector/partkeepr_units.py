@@ -1,23 +1,80 @@
-from decimal import Decimal
+import json
+import os
+import time
+from .parameter_decoder import register_prefixes, prefix_multiplier
+
+
+class PrefixTable:
+    """Prefixes supported by a unit in the form partname-resolver Unit.get_closest_prefix takes, computed once per
+    unit"""
+
+    def __init__(self, unit):
+        self.supported = {"names": [prefix['prefix'] if prefix['prefix'] != '-' else unit['symbol']
+                                    for prefix in unit['prefixes']],
+                          "multipliers": [prefix_multiplier(prefix) for prefix in unit['prefixes']]}
+
 
 class Units:
     def __init__(self, units):
         self.units = units
+        self.by_name = {}
+        self.by_symbol = {}
+        self.prefixes = {}
+        self.prefixes_by_symbol = {}
+        self.prefix_tables = {}
+        for unit in units:
+            self.by_name.setdefault(unit['name'], unit)
+            self.by_symbol.setdefault(unit['symbol'], unit)
+            prefixes = {}
+            prefixes_by_symbol = {}
+            for prefix in unit['prefixes']:
+                prefixes.setdefault(prefix['prefix'], prefix)
+                prefixes_by_symbol.setdefault(prefix['symbol'], prefix)
+            self.prefixes[unit['name']] = prefixes
+            self.prefixes_by_symbol[unit['name']] = prefixes_by_symbol
+            self.prefix_tables.setdefault(unit['name'], PrefixTable(unit))
+        register_prefixes(units)
 
     def get(self, name):
-        for unit in self.units:
-            if name == unit['name']:
-                return unit
+        return self.by_name.get(name)
+
+    def get_by_symbol(self, symbol):
+        return self.by_symbol.get(symbol)
+
+    def get_prefix_table(self, unit):
+        table = self.prefix_tables.get(unit['name'])
+        return table if table is not None else PrefixTable(unit)
 
     def get_supported_prefixes(self, unit):
-        prefixes_names = []
-        prefixes_multipliers = []
-        for prefix in unit['prefixes']:
-            prefixes_names.append(prefix['prefix'] if prefix['prefix'] != '-' else unit['symbol'])
-            prefixes_multipliers.append(Decimal(prefix['base'] ** Decimal(prefix['exponent'])))
-        return {"names": prefixes_names, 'multipliers': prefixes_multipliers}
+        """Returns {'names': [...], 'multipliers': [...]} in unit prefixes order, the dict is shared, don't modify
+        it"""
+        return self.get_prefix_table(unit).supported
 
     def get_prefix(self, unit, prefix_name):
+        if unit['name'] in self.prefixes:
+            return self.prefixes[unit['name']].get(prefix_name)
         for prefix in unit['prefixes']:
             if prefix['prefix'] == prefix_name:
                 return prefix
+
+    def get_prefix_by_symbol(self, unit, symbol):
+        if unit['name'] in self.prefixes_by_symbol:
+            return self.prefixes_by_symbol[unit['name']].get(symbol)
+        for prefix in unit['prefixes']:
+            if prefix['symbol'] == symbol:
+                return prefix
+
+    @classmethod
+    def from_cache_file(cls, filename, ttl):
+        """Load units saved by save(), returns None if file doesn't exist or is older than ttl seconds"""
+        try:
+            if time.time() - os.path.getmtime(filename) > ttl:
+                return None
+            with open(filename) as file:
+                return cls(json.load(file))
+        except (OSError, ValueError):
+            return None
+
+    def save(self, filename):
+        with open(filename, 'w') as file:
+            json.dump(self.units, file)
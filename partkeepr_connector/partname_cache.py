@@ -0,0 +1,136 @@
+import atexit
+import hashlib
+import os
+import pickle
+import sqlite3
+import subprocess
+import threading
+from collections import OrderedDict
+
+from .third_party import partname_resolver_path
+
+
+def resolver_version(path=partname_resolver_path):
+    """Returns revision of partname-resolver submodule. When the submodule has local changes, or it is not a git
+    checkout, hash of its python sources is used instead, so cached results are invalidated by any change of the
+    decoders."""
+    try:
+        toplevel, revision = subprocess.check_output(['git', '-C', path, 'rev-parse', '--show-toplevel', 'HEAD'],
+                                                     stderr=subprocess.DEVNULL, universal_newlines=True).split()
+        dirty = subprocess.call(['git', '-C', path, 'diff', '--quiet', 'HEAD'], stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL) != 0
+        # an uninitialized submodule directory belongs to the parent repository
+        if os.path.realpath(toplevel) == os.path.realpath(path) and not dirty:
+            return revision
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        pass
+    sources = hashlib.sha1()
+    for directory, directories, files in sorted(os.walk(path)):
+        directories.sort()
+        for filename in sorted(files):
+            if filename.endswith('.py'):
+                sources.update(filename.encode('utf-8'))
+                with open(os.path.join(directory, filename), 'rb') as file:
+                    sources.update(file.read())
+    return 'sources-' + sources.hexdigest()
+
+
+class PartnameCache:
+    """Cache of partname decoder results keyed by (decoder, part number, partname-resolver version).
+
+    Recently used results are kept in memory (LRU of `maxsize` entries), all results are stored in SQLite file so they
+    survive restarts. Entries made by other partname-resolver versions are dropped when the cache is opened. Results
+    are stored pickled and every lookup returns a new copy, so callers may modify returned components.
+    """
+
+    def __init__(self, filename=None, maxsize=4096, version=None):
+        self.version = version if version is not None else resolver_version()
+        self.maxsize = maxsize
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.uncommitted = 0
+        self.connection = None
+        if filename:
+            self.connection = sqlite3.connect(filename, timeout=30, check_same_thread=False)
+            with self.connection:
+                self.connection.execute("CREATE TABLE IF NOT EXISTS resolved (decoder TEXT, partnumber TEXT, "
+                                        "version TEXT, result BLOB, PRIMARY KEY (decoder, partnumber, version))")
+                self.connection.execute("DELETE FROM resolved WHERE version != ?", (self.version,))
+
+    def resolve(self, decoder, partnumber):
+        """Returns decoder.resolve(partnumber), from cache if it was resolved before"""
+        key = (decoder.__name__, partnumber)
+        with self.lock:
+            data = self.__lookup(key)
+        if data is None:
+            result = decoder.resolve(partnumber)
+            try:
+                data = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                return result
+            with self.lock:
+                self.__store(key, data)
+            return result
+        return pickle.loads(data)
+
+    def __lookup(self, key):
+        data = self.memory.get(key)
+        if data is not None:
+            self.memory.move_to_end(key)
+            return data
+        if self.connection is not None:
+            row = self.connection.execute("SELECT result FROM resolved WHERE decoder = ? AND partnumber = ? AND "
+                                          "version = ?", key + (self.version,)).fetchone()
+            if row is not None:
+                self.__remember(key, row[0])
+                return row[0]
+
+    def __remember(self, key, data):
+        self.memory[key] = data
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def __store(self, key, data):
+        self.__remember(key, data)
+        if self.connection is not None:
+            self.connection.execute("INSERT OR REPLACE INTO resolved VALUES (?, ?, ?, ?)", key + (self.version, data))
+            self.uncommitted += 1
+            if self.uncommitted >= 100:
+                self.connection.commit()
+                self.uncommitted = 0
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.commit()
+                self.connection.close()
+                self.connection = None
+
+
+default_cache = None
+default_cache_filename = "partname_cache.sqlite"
+default_cache_lock = threading.Lock()
+
+
+def configure(filename=default_cache_filename, maxsize=4096):
+    """Replace default cache used by resolve_partname, filename None keeps results in memory only"""
+    global default_cache
+    if default_cache is not None:
+        default_cache.close()
+    default_cache = PartnameCache(filename, maxsize)
+    return default_cache
+
+
+def resolve_partname(decoder, partnumber):
+    """Cached decoder.resolve(partnumber), e.g. resolve_partname(resistors_partname_decoder, 'RC0603FR-0710KL')"""
+    if default_cache is None:
+        with default_cache_lock:
+            if default_cache is None:
+                configure()
+    return default_cache.resolve(decoder, partnumber)
+
+
+@atexit.register
+def close_default_cache():
+    if default_cache is not None:
+        default_cache.close()
@@ -0,0 +1,176 @@
+"""Stage timers of autofill and validation runs.
+
+    with profiling.stage('decode', 'resistors'):
+        decoded = partkeepr.decode_part(part)
+
+Stages are recorded only after enable() is called, until then stage() returns a shared do-nothing context manager,
+so timers can stay in hot loops. Time of a stage includes stages nested in it. With enable(slowest_parts=N) parts
+processed inside part() blocks are also run under cProfile, one part at a time, and statistics of the N slowest parts
+can be dumped as pstats files.
+"""
+import cProfile
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+
+enabled = False
+slowest_parts = 0
+lock = threading.Lock()
+# (stage, category) -> [count, total seconds]
+stages = OrderedDict()
+# heap of (seconds, sequence, part id, cProfile.Profile) of the slowest parts
+slowest = []
+sequence = itertools.count()
+
+null_stage = nullcontext()
+# held by the part profiled with cProfile, only one profiler can be active in the process (Python >= 3.12 raises)
+profiler_lock = threading.Lock()
+
+
+def enable(profile_slowest_parts=0):
+    global enabled, slowest_parts
+    enabled = True
+    slowest_parts = profile_slowest_parts
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    with lock:
+        stages.clear()
+        del slowest[:]
+
+
+def record(name, category, seconds, count=1):
+    with lock:
+        totals = stages.get((name, category))
+        if totals is None:
+            totals = stages[(name, category)] = [0, 0.0]
+        totals[0] += count
+        totals[1] += seconds
+
+
+class Stage:
+    __slots__ = ('name', 'category', 'start')
+
+    def __init__(self, name, category):
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        record(self.name, self.category, time.perf_counter() - self.start)
+
+
+def stage(name, category=None):
+    """Context manager timing the block as `name` stage of `category` (e.g. component type)"""
+    if not enabled:
+        return null_stage
+    return Stage(name, category)
+
+
+def timed_iter(iterable, name, category=None):
+    """Returns iterable yielding items of iterable, time spent waiting for each item (e.g. page download) is recorded
+    as `name` stage. Iterable is returned as is when profiling is disabled."""
+    if not enabled:
+        return iterable
+    return timed_items(iter(iterable), name, category)
+
+
+def timed_items(iterator, name, category):
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            record(name, category, time.perf_counter() - start, count=0)
+            return
+        record(name, category, time.perf_counter() - start)
+        yield item
+
+
+@contextmanager
+def part(part_id, category=None):
+    """Times processing of one part as 'part' stage, when slowest parts profiling is enabled the block is run under
+    cProfile and kept if it is one of the slowest parts. Parts processed concurrently with the profiled one are only
+    timed, run them one by one to profile all of them."""
+    if not enabled:
+        yield
+        return
+    profile = None
+    if slowest_parts > 0 and profiler_lock.acquire(blocking=False):
+        profile = cProfile.Profile()
+    start = time.perf_counter()
+    if profile is not None:
+        profile.enable()
+    try:
+        yield
+    finally:
+        if profile is not None:
+            profile.disable()
+            profiler_lock.release()
+        seconds = time.perf_counter() - start
+        record('part', category, seconds)
+        if profile is not None:
+            with lock:
+                entry = (seconds, next(sequence), part_id, profile)
+                if len(slowest) < slowest_parts:
+                    heapq.heappush(slowest, entry)
+                else:
+                    heapq.heappushpop(slowest, entry)
+
+
+def snapshot():
+    """Recorded stages as {(stage, category): (count, seconds)}, e.g. to pass them from a worker process"""
+    with lock:
+        return {key: tuple(totals) for key, totals in stages.items()}
+
+
+def merge(recorded):
+    """Add stages recorded by snapshot() in another process"""
+    for (name, category), (count, seconds) in recorded.items():
+        record(name, category, seconds, count)
+
+
+def print_report():
+    """Print time per stage and per stage and category"""
+    recorded = snapshot()
+    if not recorded:
+        return
+    per_stage = OrderedDict()
+    for (name, category), (count, seconds) in recorded.items():
+        totals = per_stage.setdefault(name, [0, 0.0])
+        totals[0] += count
+        totals[1] += seconds
+    print("Profile (stage times include nested stages):")
+    for name, (count, seconds) in sorted(per_stage.items(), key=lambda item: -item[1][1]):
+        print("\t{:<20} {:10.3f}s {:8} calls {:10.3f}ms per call".format(
+            name, seconds, count, seconds / count * 1000 if count else 0))
+        for (stage_name, category), (category_count, category_seconds) in sorted(recorded.items(),
+                                                                                key=lambda item: -item[1][1]):
+            if stage_name == name and category is not None:
+                print("\t\t{:<20} {:10.3f}s {:8} calls".format(category, category_seconds, category_count))
+
+
+def dump_slowest_parts(directory):
+    """Write cProfile statistics of the slowest parts into directory, returns list of written files"""
+    os.makedirs(directory, exist_ok=True)
+    filenames = []
+    with lock:
+        entries = sorted(slowest, reverse=True)
+    for rank, (seconds, _, part_id, profile) in enumerate(entries, 1):
+        filename = os.path.join(directory, "{:03}_{}.pstats".format(rank, str(part_id).replace('/', '_').strip('_')))
+        profile.dump_stats(filename)
+        filenames.append(filename)
+        print("Profile of", part_id, "({:.3f}s)".format(seconds), "written into", filename)
+    return filenames
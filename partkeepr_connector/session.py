@@ -0,0 +1,135 @@
+import random
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from . import metrics
+
+# Status codes which mean the server may succeed if asked again later
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Methods which may be repeated without side effects, PUT always sends the whole part so it is safe to repeat too
+IDEMPOTENT_METHODS = {'get', 'head', 'options', 'put', 'delete'}
+# requests exceptions of failures which may not happen again, body cut short or badly encoded included
+TRANSIENT_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                        requests.exceptions.ChunkedEncodingError, requests.exceptions.ContentDecodingError)
+
+
+class PartkeeprApiError(Exception):
+    """Raised when Partkeepr API call failed
+
+    :retryable: True when the failure was transient (connection problem, 5xx, 429), False for fatal errors
+    :status_code: HTTP status code, None when no response was received
+    """
+
+    def __init__(self, message, method, url, status_code=None, retryable=False):
+        super(PartkeeprApiError, self).__init__(message)
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.retryable = retryable
+
+    @classmethod
+    def from_response(cls, response, method, url):
+        return cls(str(response.status_code) + " " + response.reason + " for " + method.upper() + " " + url,
+                   method, url, status_code=response.status_code,
+                   retryable=response.status_code in RETRYABLE_STATUS_CODES)
+
+
+class PartkeeprSession:
+    """Keep-alive HTTP transport to Partkeepr server.
+
+    Connections are pooled by requests.Session, so consecutive calls reuse already established TCP/TLS connection
+    instead of doing a new handshake for every request. Idempotent requests failing with a transient error are
+    retried up to `retries` times with exponential backoff and full jitter, the delay before n-th retry is a random
+    value from 0 to min(backoff_max, backoff * 2 ** n) seconds. Every attempt is recorded in `metrics` registry.
+    """
+
+    def __init__(self, url, user, pwd, pool_size=10, timeout=30, gzip=True, verify=False, retries=3, backoff=0.5,
+                 backoff_max=30, metrics_registry=None):
+        self.url = url
+        self.metrics = metrics_registry if metrics_registry is not None else metrics.default_registry
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.session = requests.Session()
+        self.session.auth = HTTPBasicAuth(user, pwd)
+        self.session.verify = verify
+        self.session.headers['Connection'] = 'keep-alive'
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate' if gzip else 'identity'
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @classmethod
+    def from_config(cls, config):
+        section = config["partkeepr"]
+        return cls(section["url"], section["user"], section["pwd"],
+                   pool_size=section.getint("pool_size", 10),
+                   timeout=section.getfloat("timeout", 30),
+                   gzip=section.getboolean("gzip", True),
+                   retries=section.getint("retries", 3),
+                   backoff=section.getfloat("backoff", 0.5),
+                   backoff_max=section.getfloat("backoff_max", 30))
+
+    def request(self, method, url, timeout=None, retries=None, **kwargs):
+        """Send request to Partkeepr
+
+        :method: request method
+        :url: part of the url to call (without base)
+        :timeout: timeout in seconds for this call only, session default is used when None
+        :retries: retries of this call only, session default is used for idempotent methods when None, 0 for callers
+                  retrying on their own
+        :returns: requests.Response object, also when the last retry returned error status
+        :raises PartkeeprApiError: when no response was received, requests exceptions are never raised
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        if retries is None:
+            retries = self.retries if method.lower() in IDEMPOTENT_METHODS else 0
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            self.metrics.in_flight.inc()
+            try:
+                response = self.session.request(method, self.url + url, timeout=timeout, **kwargs)
+                self.metrics.record_response(method, url, response, time.perf_counter() - start,
+                                             stream=kwargs.get('stream', False))
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= retries:
+                    return response
+                delay = self.__retry_after(response)
+                response.close()
+            except TRANSIENT_EXCEPTIONS as err:
+                self.metrics.record_error(method, url, time.perf_counter() - start)
+                if attempt >= retries:
+                    raise PartkeeprApiError(str(err), method, url, retryable=True)
+                delay = None
+            except requests.exceptions.RequestException as err:
+                # e.g. TooManyRedirects, InvalidURL, repeating won't help
+                self.metrics.record_error(method, url, time.perf_counter() - start)
+                raise PartkeeprApiError(str(err), method, url)
+            finally:
+                self.metrics.in_flight.dec()
+            if delay is None:
+                delay = self.backoff_delay(attempt)
+            attempt += 1
+            self.metrics.record_retry(method, url)
+            time.sleep(delay)
+
+    def backoff_delay(self, attempt):
+        """Random delay before retry following given attempt, exponential backoff with full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt))
+
+    def __retry_after(self, response):
+        try:
+            return min(float(response.headers['Retry-After']), self.backoff_max)
+        except (KeyError, ValueError):
+            return None
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,151 @@
+import fnmatch
+import importlib
+import importlib.util
+import os
+import re
+
+CATEGORY_PREFIX = 'category:'
+PARTNUMBER_PREFIX = 'partnumber:'
+
+
+class SkipList:
+    """Compiled skip list of one rule.
+
+    Entries are partkeepr ids ('/api/parts/123') or glob patterns prefixed with 'category:' matched against part
+    category path ('category:Root Category ➤ Resistors ➤ Arrays*') or with 'partnumber:' matched against manufacturer
+    part numbers ('partnumber:CRCW*'). Ids are kept in a frozenset, patterns of each kind are compiled to a single
+    regular expression, so a lookup costs the same whatever the length of the list.
+    """
+
+    def __init__(self, entries=()):
+        self.ids = frozenset(entry for entry in entries if not entry.startswith((CATEGORY_PREFIX, PARTNUMBER_PREFIX)))
+        self.category_patterns = [entry[len(CATEGORY_PREFIX):] for entry in entries
+                                  if entry.startswith(CATEGORY_PREFIX)]
+        self.partnumber_patterns = [entry[len(PARTNUMBER_PREFIX):] for entry in entries
+                                    if entry.startswith(PARTNUMBER_PREFIX)]
+        self.category_regex = self.__compile(self.category_patterns)
+        self.partnumber_regex = self.__compile(self.partnumber_patterns)
+        self.matched = set()
+
+    @staticmethod
+    def __compile(patterns):
+        if patterns:
+            return re.compile('|'.join('(?:' + fnmatch.translate(pattern) + ')' for pattern in patterns))
+
+    def __len__(self):
+        return len(self.ids) + len(self.category_patterns) + len(self.partnumber_patterns)
+
+    def entries(self):
+        return sorted(self.ids) + [CATEGORY_PREFIX + pattern for pattern in self.category_patterns] + \
+               [PARTNUMBER_PREFIX + pattern for pattern in self.partnumber_patterns]
+
+    def match(self, component):
+        """Returns entry matching the decoded component, None when the component is not in skip list"""
+        partkeepr_id = component['partkeepr_id']
+        if partkeepr_id in self.ids:
+            self.matched.add(partkeepr_id)
+            return partkeepr_id
+        if self.category_regex is not None:
+            category_path = component.get('categoryPath') or ''
+            if self.category_regex.match(category_path):
+                return self.__matched_pattern(CATEGORY_PREFIX, self.category_patterns, [category_path])
+        if self.partnumber_regex is not None:
+            partnumbers = [manufacturer['partNumber'] for manufacturer in component.get('manufacturers', [])
+                           if manufacturer.get('partNumber')]
+            if any(self.partnumber_regex.match(partnumber) for partnumber in partnumbers):
+                return self.__matched_pattern(PARTNUMBER_PREFIX, self.partnumber_patterns, partnumbers)
+
+    def __contains__(self, component):
+        return self.match(component) is not None
+
+    def __matched_pattern(self, prefix, patterns, values):
+        for pattern in patterns:
+            if any(fnmatch.fnmatchcase(value, pattern) for value in values):
+                self.matched.add(prefix + pattern)
+                return prefix + pattern
+
+
+class SkipRules:
+    """Skip lists loaded from python files, each module level list of the file is a skip list of the rule with the
+    same name (e.g. test_has_voltage_parameter = ['/api/parts/12']). Lists are addressed by (module name, list name),
+    module name is the file name without extension. Modules not loaded from files are imported by name, like skip
+    lists were imported before they were configurable."""
+
+    def __init__(self):
+        self.locations = []
+        self.modules = {}
+        self.lists = {}
+
+    @classmethod
+    def from_locations(cls, locations):
+        """:locations: comma separated skip file paths, as in [validator] test_skip_file_location"""
+        skip_rules = cls()
+        for location in locations.replace('"', '').split(','):
+            location = location.strip()
+            if location:
+                skip_rules.load_file(location)
+        return skip_rules
+
+    @classmethod
+    def from_config(cls, config, section, option):
+        return cls.from_locations(config.get(section, option, fallback=""))
+
+    def load_file(self, filename):
+        if not os.path.exists(filename):
+            print("Skip file", filename, "not found, no parts are skipped by its lists.")
+            return
+        self.locations.append(filename)
+        name = os.path.splitext(os.path.basename(filename))[0]
+        spec = importlib.util.spec_from_file_location(name, filename)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        self.modules[name] = module
+
+    def __module(self, name):
+        if name not in self.modules:
+            try:
+                self.modules[name] = importlib.import_module(name)
+            except ImportError:
+                self.modules[name] = None
+        return self.modules[name]
+
+    def defines(self, module_name, list_name):
+        """True when the skip module exists and has the list"""
+        return hasattr(self.__module(module_name), list_name)
+
+    def get(self, module_name, list_name):
+        """Returns SkipList, empty when the module or list doesn't exist"""
+        key = (module_name, list_name)
+        if key not in self.lists:
+            entries = getattr(self.__module(module_name), list_name, [])
+            self.lists[key] = SkipList(list(entries))
+        return self.lists[key]
+
+    def unused(self, matched=None):
+        """Returns {(module name, list name): [entries]} of entries which didn't match any checked part, lists of
+        loaded modules never asked for are reported as a whole.
+
+        :matched: {(module name, list name): set of entries} matched elsewhere (e.g. in worker processes), entries
+                  matched by lists of this instance are used when None
+        """
+        for module_name, module in self.modules.items():
+            if module is None:
+                continue
+            for list_name, value in vars(module).items():
+                if not list_name.startswith('_') and isinstance(value, (list, tuple, set, frozenset)):
+                    self.get(module_name, list_name)
+        unused = {}
+        for key, skip_list in self.lists.items():
+            used = skip_list.matched if matched is None else matched.get(key, set())
+            entries = [entry for entry in skip_list.entries() if entry not in used]
+            if entries:
+                unused[key] = entries
+        return unused
+
+    def print_unused(self, matched=None):
+        print_unused(self.unused(matched))
+
+
+def print_unused(unused):
+    for (module_name, list_name), entries in sorted(unused.items()):
+        print("Unused skip entries in", module_name + "." + list_name + ":", ", ".join(entries))
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import sqlite3
+import time
+
+
+class InventorySnapshot:
+    """Local copy of Partkeepr inventory kept in SQLite database.
+
+    Every part is stored together with its decoded form and a hash of its content, keyed by part @id. Partkeepr API
+    has no modification date of a part, so sync compares hashes of the parts streamed from the server with the stored
+    ones and decodes and writes only parts that were added or changed since the last sync.
+    """
+
+    def __init__(self, filename):
+        self.connection = sqlite3.connect(filename)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS parts (id TEXT PRIMARY KEY, category_path TEXT, "
+                                    "hash TEXT, part TEXT, decoded TEXT, synced REAL)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS sync (key TEXT PRIMARY KEY, value TEXT)")
+
+    @staticmethod
+    def part_hash(part):
+        return hashlib.sha1(json.dumps(part, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+    def sync(self, parts, decode, encoder=None):
+        """Bring snapshot up to date with parts
+
+        :parts: iterable of all parts present on the server, parts not in it are removed from snapshot
+        :decode: function used to decode added and changed parts
+        :encoder: JSON encoder class for decoded parts
+        :returns: dict with count of added, changed, removed and unchanged parts
+        """
+        known = dict(self.connection.execute("SELECT id, hash FROM parts"))
+        # parts stored without decoded form by earlier versions, which decoded only parts of configured categories
+        undecoded = {part_id for (part_id,) in self.connection.execute("SELECT id FROM parts WHERE decoded = 'null'")}
+        stats = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+        now = time.time()
+        with self.connection:
+            seen = set()
+            for part in parts:
+                part_id = part['@id']
+                seen.add(part_id)
+                part_hash = self.part_hash(part)
+                if known.get(part_id) == part_hash and part_id not in undecoded:
+                    stats['unchanged'] += 1
+                    continue
+                stats['changed' if part_id in known else 'added'] += 1
+                self.connection.execute("INSERT OR REPLACE INTO parts VALUES (?, ?, ?, ?, ?, ?)",
+                                        (part_id, part['categoryPath'], part_hash, json.dumps(part),
+                                         json.dumps(decode(part), cls=encoder), now))
+            removed = [(part_id,) for part_id in known if part_id not in seen]
+            self.connection.executemany("DELETE FROM parts WHERE id = ?", removed)
+            stats['removed'] = len(removed)
+            self.connection.execute("INSERT OR REPLACE INTO sync VALUES ('last_sync', ?)", (str(now),))
+        return stats
+
+    def last_sync(self):
+        row = self.connection.execute("SELECT value FROM sync WHERE key = 'last_sync'").fetchone()
+        return float(row[0]) if row is not None else None
+
+    def parts(self, parse_float=None):
+        """Yields (part, decoded part) tuples ordered by part id"""
+        for part, decoded in self.connection.execute("SELECT part, decoded FROM parts ORDER BY length(id), id"):
+            yield json.loads(part, parse_float=parse_float), json.loads(decoded, parse_float=parse_float)
+
+    def decoded_parts(self, parse_float=None):
+        """Yields (category path, decoded part) tuples ordered by part id, without parsing stored raw parts"""
+        for category_path, decoded in self.connection.execute("SELECT category_path, decoded FROM parts "
+                                                              "ORDER BY length(id), id"):
+            yield category_path, json.loads(decoded, parse_float=parse_float)
+
+    def get_part(self, part_id):
+        row = self.connection.execute("SELECT part FROM parts WHERE id = ?", (part_id,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,12 @@
+import os
+import sys
+
+partname_resolver_path = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'third_party',
+                                      'partname-resolver')
+
+
+def add_partname_resolver_path():
+    """Make partname_resolver package from third_party/partname-resolver submodule importable, wherever the program
+    is started from. Safe to call any number of times."""
+    if partname_resolver_path not in sys.path:
+        sys.path.insert(1, partname_resolver_path)
@@ -0,0 +1,57 @@
+import unittest
+from decimal import Decimal
+
+from benchmarks.inventory import generate_units
+from partkeepr_connector.partkeepr_units import Units
+from partkeepr_connector.third_party import add_partname_resolver_path
+
+add_partname_resolver_path()
+from partname_resolver.units.resistance import Resistance
+from partname_resolver.units.capacitance import Capacitance
+from partname_resolver.units.inductance import Inductance
+
+
+def supported_prefixes_uncached(unit):
+    """Units.get_supported_prefixes before prefixes were cached per unit"""
+    prefixes_names = []
+    prefixes_multipliers = []
+    for prefix in unit['prefixes']:
+        prefixes_names.append(prefix['prefix'] if prefix['prefix'] != '-' else unit['symbol'])
+        prefixes_multipliers.append(Decimal(prefix['base'] ** Decimal(prefix['exponent'])))
+    return {"names": prefixes_names, 'multipliers': prefixes_multipliers}
+
+
+def prefix_uncached(unit, prefix_name):
+    """Units.get_prefix before prefixes were indexed by name"""
+    for prefix in unit['prefixes']:
+        if prefix['prefix'] == prefix_name:
+            return prefix
+
+
+class UnitsPrefixesTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.units = Units(generate_units())
+
+    def test_supported_prefixes_equal_uncached(self):
+        for unit in self.units.units:
+            with self.subTest(unit['name']):
+                self.assertEqual(self.units.get_supported_prefixes(unit), supported_prefixes_uncached(unit))
+
+    def test_prefix_and_value_equal_uncached(self):
+        values = [mantissa * Decimal(10) ** exponent for exponent in range(-15, 10)
+                  for mantissa in (Decimal(1), Decimal('2.2'), Decimal('4.7'), Decimal(10), Decimal(330))]
+        for quantity in (Resistance, Capacitance, Inductance):
+            for value in values:
+                with self.subTest(quantity.__name__ + " " + str(value)):
+                    quantity_value = quantity(value)
+                    unit = self.units.get(quantity_value.name)
+                    old_prefix = quantity_value.get_closest_prefix(supported_prefixes_uncached(unit)['names'])
+                    prefix = quantity_value.get_closest_prefix(self.units.get_supported_prefixes(unit)['names'])
+                    self.assertEqual(prefix, old_prefix)
+                    self.assertEqual(quantity_value.get_value_as(prefix), quantity_value.get_value_as(old_prefix))
+                    self.assertIs(self.units.get_prefix(unit, prefix), prefix_uncached(unit, old_prefix))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,13 +1,28 @@
-from partkeepr_connector.partkeepr import Partkeepr
-import configparser
+import argparse
+import sys
 import unittest
 from capacitors_test import *
 from resistors_test import *
+from validation.unittest_adapter import validation_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download components from partkeepr and validate them, other "
+                                                 "arguments are passed to unittest")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="number of validation processes, defaults to [validator] jobs config value")
+    parser.add_argument('--full', action='store_true',
+                        help="validate all parts, not only parts changed since the last validation")
+    args, unittest_args = parser.parse_known_args()
+
+    from common import read_config
+    from partkeepr_connector.partkeepr import Partkeepr
+    config = read_config()
+    with Partkeepr(config) as partkeepr:
+        partkeepr.get_components()
+    validation_report(jobs=args.jobs, full=args.full, config=config)
+    unittest.main(argv=[sys.argv[0]] + unittest_args)
 
-config = configparser.ConfigParser()
-config.read("config.ini")
-partkeepr = Partkeepr(config)
-partkeepr.get_components()
 
 if __name__ == '__main__':
-    unittest.main()
+    main()
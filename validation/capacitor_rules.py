@@ -0,0 +1,79 @@
+from common import *
+from .engine import rule, check, NotApplicable
+
+COMPONENT_TYPES = ('capacitors',)
+
+
+@rule('capacitors', COMPONENT_TYPES, skip=('skip_capacitors_test', 'test_single_manufacturer_per_part'))
+def test_single_manufacturer_per_part(capacitor, context):
+    check.assertEqual(len(capacitor["manufacturers"]), 1)
+
+
+@rule('capacitors', COMPONENT_TYPES)
+def test_part_name_equal_manufacturer_part_name(capacitor, context):
+    if len(capacitor["manufacturers"]) > 0:
+        check.assertEqual(capacitor["name"], capacitor["manufacturers"][0]["partNumber"])
+
+
+@rule('capacitors', COMPONENT_TYPES)
+def test_has_production_remarks(capacitor, context):
+    check.assertIn(capacitor["productionRemarks"], ["SMD", "SMT", "THT", "Screw"])
+
+
+@rule('capacitors', COMPONENT_TYPES)
+def test_has_capacitance_parameter(capacitor, context):
+    check.assertIn("Capacitance", capacitor["parameters"])
+    capacitance = capacitor["parameters"]["Capacitance"]
+    if capacitance["valueMin"] is not None or capacitance['valueMax'] is not None:
+        check.assertIsNotNone(capacitance["valueMin"])
+        check.assertIsNotNone(capacitance["valueMax"])
+    else:
+        check.assertIsNotNone(capacitance["value"])
+    check.assertEqual(capacitance["unit"], "Farad")
+
+
+@rule('capacitors', COMPONENT_TYPES)
+def test_has_tolerance_parameter(capacitor, context):
+    check.assertIn("Tolerance", capacitor["parameters"])
+    check.assertIsNotNone(capacitanceTolerance_from_partkeepr_json(capacitor["parameters"]["Tolerance"]))
+
+
+@rule('capacitors', COMPONENT_TYPES, skip=('skip_capacitors_test', 'test_has_voltage_parameter'))
+def test_has_voltage_parameter(capacitor, context):
+    check.assertIn("Voltage", capacitor["parameters"])
+
+
+@rule('capacitors', COMPONENT_TYPES)
+def test_has_capacitor_type_parameter(capacitor, context):
+    check.assertIn("Capacitor Type", capacitor["parameters"])
+
+
+@rule('capacitors', COMPONENT_TYPES)
+def test_footprint(capacitor, context):
+    if capacitor["productionRemarks"] == "SMD":
+        check.assertIn(capacitor["footprint"], ["0402", "0603", "0805", "1206", "1210", "2512"])
+
+
+@rule('capacitors', COMPONENT_TYPES)
+def test_description_format(capacitor, context):
+    if context.partnumber is not None:
+        cap = context.resolved
+    else:
+        cap = context.from_parameters
+    check.assertIsNotNone(cap)
+    check.assertEqual(cap.get_description(), capacitor["description"])
+
+
+@rule('capacitors', COMPONENT_TYPES)
+def test_parameters_equal_decoded_parameters_from_partname(capacitor, context):
+    if context.partnumber is None or len(context.partnumber) == 0:
+        raise NotApplicable
+    parameters = capacitor["parameters"]
+    tolerance = capacitanceTolerance_from_partkeepr_json(capacitor["parameters"]["Tolerance"])
+    decoded_parameters = context.resolved
+    check.assertIsNotNone(decoded_parameters)
+    check.assertEqual(decoded_parameters.capacitance, capacitance_from_partkeepr_parameters(parameters))
+    check.assertEqual(decoded_parameters.voltage.replace("DC", ""), parameters["Voltage"]["value"] + "V")
+    check.assertEqual(decoded_parameters.dielectric_type,
+                      parameters["Dielectric Type"]["value"] if "Dielectric Type" in parameters else None)
+    check.assertEqual(decoded_parameters.tolerance, tolerance)
@@ -0,0 +1,37 @@
+from .engine import rule, check
+
+COMPONENT_TYPES = ('inductors', 'resistors', 'capacitors')
+
+
+@rule('common', COMPONENT_TYPES, skip=('skip_common_test', 'test_single_manufacturer_per_part'),
+      legacy_skip=('skip_resistors_test', 'test_single_manufacturer_per_part'))
+def test_single_manufacturer_per_part(component, context):
+    check.assertEqual(len(component["manufacturers"]), 1)
+
+
+@rule('common', COMPONENT_TYPES)
+def test_part_name_equal_manufacturer_part_name(component, context):
+    if len(component["manufacturers"]) > 0:
+        check.assertEqual(component["name"], component["manufacturers"][0]["partNumber"])
+
+
+@rule('common', COMPONENT_TYPES)
+def test_has_production_remarks(component, context):
+    check.assertIn(component["productionRemarks"], ["SMD", "SMT", "THT", "Screw"])
+
+
+@rule('common', COMPONENT_TYPES, skip=('skip_common_test', 'test_working_temperature_parameter'),
+      legacy_skip=('skip_resistors_test', 'test_working_temperature_parameter'))
+def test_working_temperature_parameter(component, context):
+    check.assertIn("Working Temperature", component["parameters"])
+    working_temperature = component["parameters"]["Working Temperature"]
+    check.assertEqual(working_temperature["unit"], "Celsius")
+    check.assertIsNone(working_temperature["value"])
+    check.assertIsNotNone(working_temperature["valueMin"])
+    check.assertIsNotNone(working_temperature["valueMax"])
+
+
+@rule('common', COMPONENT_TYPES)
+def test_footprint(component, context):
+    if component["productionRemarks"] == "SMD":
+        check.assertIn(component["footprint"], ["0402", "0603", "0805", "1206", "2512"])
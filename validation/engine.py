@@ -0,0 +1,294 @@
+import importlib
+import traceback
+import unittest
+from collections import OrderedDict
+
+from partkeepr_connector.skip_rules import SkipRules, SkipList
+from partkeepr_connector.third_party import add_partname_resolver_path
+from partkeepr_connector import profiling
+
+# assert* methods of unittest.TestCase used by rules, failed check raises AssertionError
+check = unittest.TestCase()
+
+PASSED = 'passed'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+ERROR = 'error'
+
+# all registered rules in registration order
+rules = []
+
+RULE_MODULES = ['validation.common_rules', 'validation.resistor_rules', 'validation.capacitor_rules',
+                'validation.inductor_rules']
+
+
+class NotApplicable(Exception):
+    """Raised by rule when it doesn't apply to the part, no result is recorded then"""
+
+
+class Rule:
+    def __init__(self, function, suite, name, component_types, skip=None, legacy_skip=None):
+        """
+        :suite: name of the group of rules, the unittest adapter maps a suite to one TestCase
+        :name: name of the rule, unique in the suite
+        :component_types: component types (e.g. 'resistors') the rule is applied to
+        :skip: (skip module name, list name) of skip list of parts the rule is skipped for, see SkipRules
+        :legacy_skip: (skip module name, list name) the skip list was read from before, used when the skip module
+                      doesn't define the list yet
+        """
+        self.function = function
+        self.suite = suite
+        self.name = name
+        self.component_types = component_types
+        self.skip = skip
+        self.legacy_skip = legacy_skip
+
+    @property
+    def id(self):
+        return self.suite + '.' + self.name
+
+
+def rule(suite, component_types, name=None, skip=None, legacy_skip=None):
+    """Decorator registering validation rule, the decorated function takes (component, context) and uses check.assert*
+    methods"""
+    def register(function):
+        rules.append(Rule(function, suite, name if name is not None else function.__name__, component_types, skip,
+                          legacy_skip))
+        return function
+    return register
+
+
+def load_rules():
+    for module in RULE_MODULES:
+        importlib.import_module(module)
+    return rules
+
+
+class PartContext:
+    """Values derived from a component shared by all rules run on it, each is computed at most once"""
+
+    def __init__(self, component, component_type):
+        self.component = component
+        self.component_type = component_type
+        self.__values = {}
+
+    def __cached(self, name, function):
+        if name not in self.__values:
+            self.__values[name] = function()
+        return self.__values[name]
+
+    @property
+    def partnumber(self):
+        """Manufacturer part number of the first manufacturer, None when part has no manufacturer"""
+        manufacturers = self.component['manufacturers']
+        return manufacturers[0]['partNumber'] if len(manufacturers) > 0 else None
+
+    @property
+    def resolved(self):
+        """Component decoded from manufacturer part number, None when part has no manufacturer or it can't be
+        decoded"""
+        return self.__cached('resolved', self.__resolve)
+
+    @property
+    def from_parameters(self):
+        """Component made from part parameters"""
+        return self.__cached('from_parameters', self.__from_parameters)
+
+    def __resolve(self):
+        from common import resolve_partname
+        decoder = partname_decoder(self.component_type)
+        if decoder is None or self.partnumber is None:
+            return None
+        with profiling.stage('resolve', self.component_type):
+            return resolve_partname(decoder, self.partnumber)
+
+    def __from_parameters(self):
+        from common import resistor_from_partkeepr_json, capacitor_from_partkeepr_json
+        converters = {'resistors': resistor_from_partkeepr_json, 'capacitors': capacitor_from_partkeepr_json}
+        with profiling.stage('decode', self.component_type):
+            return converters[self.component_type](self.component)
+
+
+def partname_decoder(component_type):
+    add_partname_resolver_path()
+    if component_type == 'resistors':
+        from partname_resolver.resistors import resistors_partname_decoder
+        return resistors_partname_decoder
+    if component_type == 'capacitors':
+        from partname_resolver.capacitors import capacitors_partname_decoder
+        return capacitors_partname_decoder
+    if component_type == 'inductors':
+        from partname_resolver.inductors import inductors_partname_decoder
+        return inductors_partname_decoder
+
+
+class RuleResult:
+    def __init__(self, rule_id, component_type, partkeepr_id, name, status, message=None, skip_entry=None):
+        """:skip_entry: skip list entry which matched the part, when status is SKIPPED"""
+        self.rule_id = rule_id
+        self.component_type = component_type
+        self.partkeepr_id = partkeepr_id
+        self.name = name
+        self.status = status
+        self.message = message
+        self.skip_entry = skip_entry
+
+    @property
+    def label(self):
+        return self.name + " (" + self.partkeepr_id.replace("/api/parts/", "") + ")"
+
+    def to_dict(self):
+        return {'rule': self.rule_id, 'component_type': self.component_type, 'partkeepr_id': self.partkeepr_id,
+                'name': self.name, 'status': self.status, 'message': self.message, 'skip_entry': self.skip_entry}
+
+    @classmethod
+    def from_dict(cls, result):
+        return cls(result['rule'], result['component_type'], result['partkeepr_id'], result['name'],
+                   result['status'], result['message'], result.get('skip_entry'))
+
+
+class ValidationReport:
+    def __init__(self, results=None):
+        self.results = results if results is not None else []
+        # number of parts validated in this run and of parts whose results were taken from ResultCache
+        self.validated = 0
+        self.cached = 0
+
+    def extend(self, results):
+        self.results.extend(results)
+
+    def for_rule(self, rule_id):
+        return [result for result in self.results if result.rule_id == rule_id]
+
+    def summary(self):
+        """Returns {rule id: {status: count}} in rule order"""
+        summary = OrderedDict()
+        for result in self.results:
+            counts = summary.setdefault(result.rule_id, OrderedDict((status, 0) for status in
+                                                                      [PASSED, FAILED, SKIPPED, ERROR]))
+            counts[result.status] += 1
+        return summary
+
+    @property
+    def passed(self):
+        return all(result.status in (PASSED, SKIPPED) for result in self.results)
+
+    def print_summary(self, verbose=False):
+        if self.cached:
+            print("Validated", self.validated, "parts,", self.cached, "unchanged parts results taken from cache")
+        for rule_id, counts in self.summary().items():
+            print(rule_id + ":", ", ".join(status + " " + str(count) for status, count in counts.items()))
+        for result in self.results:
+            if result.status in (FAILED, ERROR) or (verbose and result.status == SKIPPED):
+                print("\t" + result.status.upper(), result.rule_id, result.label + ":", result.message)
+
+    def to_dict(self):
+        return [result.to_dict() for result in self.results]
+
+
+class ValidationEngine:
+    """Runs every applicable rule on each component, components are visited once and values derived from them
+    (decoded part number, component made from parameters) are shared by all rules through PartContext."""
+
+    def __init__(self, rules_to_run=None, skip_rules=None):
+        """:skip_rules: SkipRules with skip lists of the rules, skip modules are imported by name when None"""
+        self.rules = rules_to_run if rules_to_run is not None else load_rules()
+        self.skip_rules = skip_rules if skip_rules is not None else SkipRules()
+        # rule id -> (skip module name, list name) the rule skip list is read from
+        self.__skip_keys = {}
+
+    def skip_key(self, rule_to_check):
+        """(skip module name, list name) of the rule skip list, the legacy list is used until the list is defined in
+        the rule skip module"""
+        if rule_to_check.id not in self.__skip_keys:
+            key = rule_to_check.skip
+            if key is not None and rule_to_check.legacy_skip is not None and not self.skip_rules.defines(*key) and \
+                    self.skip_rules.defines(*rule_to_check.legacy_skip):
+                key = rule_to_check.legacy_skip
+            self.__skip_keys[rule_to_check.id] = key
+        return self.__skip_keys[rule_to_check.id]
+
+    def skip_list(self, rule_to_check):
+        key = self.skip_key(rule_to_check)
+        if key is None:
+            return SkipList()
+        return self.skip_rules.get(*key)
+
+    def legacy_skip_lists(self):
+        """Returns [(legacy (module name, list name), (module name, list name), used)] of the rules whose legacy skip
+        list is still defined, used is False when the list was moved already and the legacy one is ignored. Legacy
+        list which is a skip list of another rule (e.g. of resistors) is reported only while it is used"""
+        own = {rule_to_check.skip for rule_to_check in self.rules}
+        legacy = []
+        for rule_to_check in self.rules:
+            if rule_to_check.legacy_skip is None or not self.skip_rules.defines(*rule_to_check.legacy_skip):
+                continue
+            used = self.skip_key(rule_to_check) == rule_to_check.legacy_skip
+            if used or rule_to_check.legacy_skip not in own:
+                legacy.append((rule_to_check.legacy_skip, rule_to_check.skip, used))
+        return legacy
+
+    def unused_skip_entries(self, report):
+        """Skip list entries of the rules which didn't match any part of the report"""
+        matched = {}
+        rule_skip = {rule_to_check.id: self.skip_key(rule_to_check) for rule_to_check in self.rules}
+        for result in report.results:
+            if result.skip_entry is not None:
+                matched.setdefault(rule_skip[result.rule_id], set()).add(result.skip_entry)
+        for rule_to_check in self.rules:
+            if self.skip_key(rule_to_check) is not None:
+                self.skip_list(rule_to_check)
+        return self.skip_rules.unused(matched)
+
+    def validate(self, component, component_type):
+        """Run all rules applicable to component type on the component, returns list of RuleResult"""
+        with profiling.part(component['partkeepr_id'], component_type):
+            return self.__validate(component, component_type)
+
+    def __validate(self, component, component_type):
+        context = PartContext(component, component_type)
+        results = []
+        for rule_to_run in self.rules:
+            if component_type not in rule_to_run.component_types:
+                continue
+            status, message = PASSED, None
+            skip_entry = self.skip_list(rule_to_run).match(component)
+            if skip_entry is not None:
+                status, message = SKIPPED, str(component['name']) + " part in skip list"
+            else:
+                try:
+                    with profiling.stage('compare', component_type):
+                        rule_to_run.function(component, context)
+                except NotApplicable:
+                    continue
+                except AssertionError as error:
+                    status, message = FAILED, str(error)
+                except Exception:
+                    status, message = ERROR, traceback.format_exc()
+            results.append(RuleResult(rule_to_run.id, component_type, component['partkeepr_id'], component['name'],
+                                      status, message, skip_entry))
+        return results
+
+    def run(self, components_by_type, jobs=1, cache=None, full=False):
+        """:components_by_type: dict component type -> list of decoded components
+        :jobs: number of worker processes, components are validated in this process when it is 1. Rules run in
+               workers are looked up by id in rules loaded by load_rules().
+        :cache: ResultCache, only components changed since their results were stored are validated
+        :full: validate all components even if cache has their results"""
+        if cache is not None:
+            from .result_cache import run_incremental
+            return run_incremental(self, components_by_type, cache, jobs, full)
+        return self.run_all(components_by_type, jobs)
+
+    def run_all(self, components_by_type, jobs=1):
+        """Validate all components, see run()"""
+        if jobs > 1:
+            from .parallel import run_parallel
+            report = run_parallel(self, components_by_type, jobs)
+        else:
+            report = ValidationReport()
+            for component_type, components in components_by_type.items():
+                for component in components:
+                    report.extend(self.validate(component, component_type))
+        report.validated = sum(len(components) for components in components_by_type.values())
+        return report
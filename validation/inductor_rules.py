@@ -0,0 +1,42 @@
+from common import *
+from .engine import rule, check, NotApplicable
+
+from partname_resolver.units.inductance import Inductance
+
+COMPONENT_TYPES = ('inductors',)
+
+
+@rule('inductors', COMPONENT_TYPES, skip=('skip_inductors_test', 'test_inductance_parameter'),
+      legacy_skip=('skip_resistors_test', 'test_has_resistance_parameter'))
+def test_inductance_parameter(inductor, context):
+    check.assertIn("Inductance", inductor["parameters"])
+    inductance = inductor["parameters"]["Inductance"]
+    check.assertIsNotNone(inductance["value"])
+    check.assertEqual(inductance["unit"], "Henry")
+
+
+@rule('inductors', COMPONENT_TYPES)
+def test_description_format(inductor, context):
+    res = context.resolved
+    if res is None:
+        res = inductor_from_partkeepr_json(inductor)
+    check.assertIsNotNone(res)
+    check.assertEqual(res.get_description(), inductor["description"])
+
+
+@rule('inductors', COMPONENT_TYPES,
+      skip=('skip_inductors_test', 'test_parameters_equal_decoded_parameters_from_partname'),
+      legacy_skip=('skip_resistors_test', 'test_parameters_equal_decoded_parameters_from_partname'))
+def test_parameters_equal_decoded_parameters_from_partname(inductor, context):
+    if context.partnumber is None or len(context.partnumber) == 0:
+        raise NotApplicable
+    decoded_parameters = context.resolved
+    check.assertIsNotNone(decoded_parameters)
+    parameters = inductor["parameters"]
+    check.assertEqual(decoded_parameters.inductance, Inductance(parameters["Inductance"]["value"]))
+    tolerance = tolerance_from_partkeepr_json(parameters["Tolerance"])
+    check.assertEqual(decoded_parameters.tolerance, tolerance)
+    working_temperature = working_temperature_range_from_partkeepr_json(parameters)
+    check.assertEqual(decoded_parameters.max_working_voltage, str(parameters['Voltage']['valueMax']) + "V")
+    if working_temperature is not None:
+        check.assertEqual(decoded_parameters.working_temperature_range, working_temperature)
@@ -0,0 +1,58 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import util
+
+from partkeepr_connector.skip_rules import SkipRules
+from partkeepr_connector import profiling
+from . import engine
+
+# engine of the worker process, created by the pool initializer
+worker_engine = None
+
+
+def shards(components_by_type, jobs, shards_per_job=4):
+    """Splits components into (component type, start index, components) shards in component type and index order.
+    Each component type is split separately, into at most jobs * shards_per_job shards, so slow categories are
+    spread over all workers."""
+    for component_type, components in components_by_type.items():
+        size = max(1, math.ceil(len(components) / (jobs * shards_per_job)))
+        for start in range(0, len(components), size):
+            yield component_type, start, components[start:start + size]
+
+
+def init_worker(rule_ids, skip_locations, profile):
+    global worker_engine
+    if profile:
+        profiling.enable()
+    from partkeepr_connector import partname_cache
+    # sqlite connection inherited from the parent process can't be used after fork, worker opens its own one.
+    # Pool workers exit without running atexit handlers, so the cache is closed by multiprocessing finalizer.
+    partname_cache.default_cache = None
+    util.Finalize(None, partname_cache.close_default_cache, exitpriority=10)
+    rules_by_id = {rule.id: rule for rule in engine.load_rules()}
+    worker_engine = engine.ValidationEngine([rules_by_id[rule_id] for rule_id in rule_ids],
+                                            SkipRules.from_locations(','.join(skip_locations)))
+
+
+def validate_shard(shard):
+    component_type, start, components = shard
+    results = []
+    profiling.reset()
+    for component in components:
+        results.extend(worker_engine.validate(component, component_type))
+    return results, profiling.snapshot() if profiling.enabled else None
+
+
+def run_parallel(validation_engine, components_by_type, jobs):
+    """Validates components in a pool of `jobs` processes. Results of shards are merged in shard order, so the report
+    is the same as the one made by serial ValidationEngine.run."""
+    report = engine.ValidationReport()
+    rule_ids = [rule.id for rule in validation_engine.rules]
+    # stages of worker processes are merged into profile of this process, cProfile of slowest parts isn't
+    initargs = (rule_ids, validation_engine.skip_rules.locations, profiling.enabled)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=initargs) as executor:
+        for results, recorded in executor.map(validate_shard, shards(components_by_type, jobs)):
+            report.extend(results)
+            if recorded is not None:
+                profiling.merge(recorded)
+    return report
@@ -0,0 +1,65 @@
+from common import *
+from .engine import rule, check, NotApplicable
+
+from partname_resolver.units.resistance import Resistance
+from partname_resolver.units.power import Power
+
+COMPONENT_TYPES = ('resistors',)
+
+
+@rule('resistors', COMPONENT_TYPES, skip=('skip_resistors_test', 'test_has_resistance_parameter'))
+def test_has_resistance_parameter(resistor, context):
+    check.assertIn("Resistance", resistor["parameters"])
+    resistance = resistor["parameters"]["Resistance"]
+    check.assertIsNotNone(resistance["value"])
+    check.assertEqual(resistance["unit"], "Ohm")
+
+
+@rule('resistors', COMPONENT_TYPES, skip=('skip_resistors_test', 'test_has_tolerance_parameter'))
+def test_has_tolerance_parameter(resistor, context):
+    check.assertIn("Tolerance", resistor["parameters"])
+    tolerance = resistor["parameters"]["Tolerance"]
+    check.assertIsNotNone(tolerance["value"])
+
+
+@rule('resistors', COMPONENT_TYPES, skip=('skip_resistors_test', 'test_has_voltage_parameter'))
+def test_has_voltage_parameter(resistor, context):
+    check.assertIn("Voltage", resistor["parameters"])
+    check.assertIsNotNone(resistor["parameters"]['Voltage']['valueMax'])
+
+
+@rule('resistors', COMPONENT_TYPES, skip=('skip_resistors_test', 'test_has_power_parameter'))
+def test_has_power_parameter(resistor, context):
+    check.assertIn("Power", resistor["parameters"])
+    power = resistor["parameters"]["Power"]
+    check.assertEqual(power["unit"], "Watt")
+    check.assertIsNone(power["value"])
+    check.assertIsNone(power["valueMin"])
+    check.assertIsNotNone(power["valueMax"])
+
+
+@rule('resistors', COMPONENT_TYPES)
+def test_description_format(resistor, context):
+    res = context.resolved
+    if res is None:
+        res = context.from_parameters
+    check.assertIsNotNone(res)
+    check.assertEqual(res.get_description(), resistor["description"])
+
+
+@rule('resistors', COMPONENT_TYPES,
+      skip=('skip_resistors_test', 'test_parameters_equal_decoded_parameters_from_partname'))
+def test_parameters_equal_decoded_parameters_from_partname(resistor, context):
+    if context.partnumber is None or len(context.partnumber) == 0:
+        raise NotApplicable
+    parameters = resistor["parameters"]
+    tolerance = tolerance_from_partkeepr_json(parameters["Tolerance"])
+    working_temperature = working_temperature_range_from_partkeepr_json(parameters)
+    decoded_parameters = context.resolved
+    check.assertIsNotNone(decoded_parameters)
+    check.assertEqual(Resistance(parameters["Resistance"]["value"]), decoded_parameters.resistance)
+    check.assertEqual(Power(parameters["Power"]["valueMax"]), decoded_parameters.power)
+    check.assertEqual(tolerance, decoded_parameters.tolerance)
+    check.assertEqual(decoded_parameters.max_working_voltage, str(parameters['Voltage']['valueMax']) + "V")
+    if working_temperature is not None:
+        check.assertEqual(decoded_parameters.working_temperature_range, working_temperature)
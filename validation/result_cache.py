@@ -0,0 +1,115 @@
+import hashlib
+import inspect
+import json
+import sqlite3
+import sys
+
+from partkeepr_connector.compact_component import json_default
+from .engine import RuleResult, ValidationReport
+
+
+def component_hash(component):
+    """Hash of decoded component (dict or compact Component), Decimal values are hashed by their string form"""
+    data = json.dumps(component, sort_keys=True, separators=(',', ':'), default=json_default)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def ruleset_version(validation_engine):
+    """Hash of everything rule results depend on apart from the component and partname-resolver: rule ids, sources of
+    modules defining the rules and of common.py helpers used by them, and content of the skip lists."""
+    version = hashlib.sha1()
+    modules = set()
+    for rule in validation_engine.rules:
+        version.update(rule.id.encode('utf-8'))
+        modules.add(rule.function.__module__)
+        version.update(repr(validation_engine.skip_list(rule).entries()).encode('utf-8'))
+    for module in sorted(modules) + ['common']:
+        if module in sys.modules:
+            version.update(inspect.getsource(sys.modules[module]).encode('utf-8'))
+    return version.hexdigest()
+
+
+class ResultCache:
+    """Results of validation of every part stored in SQLite, together with hash of the validated component and
+    versions of partname-resolver and of the rule set. Results are reused only when all of them are unchanged."""
+
+    def __init__(self, filename, resolver_version, ruleset_version):
+        self.resolver_version = resolver_version
+        self.ruleset_version = ruleset_version
+        self.connection = sqlite3.connect(filename)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS results (component_type TEXT, partkeepr_id TEXT, "
+                                    "hash TEXT, resolver_version TEXT, ruleset_version TEXT, results TEXT, "
+                                    "PRIMARY KEY (component_type, partkeepr_id))")
+
+    def get(self, component_type, partkeepr_id, hash):
+        """Returns list of RuleResult stored for the part, None when there are no results for this content of the part
+        and current versions"""
+        row = self.connection.execute("SELECT results FROM results WHERE component_type = ? AND partkeepr_id = ? AND "
+                                      "hash = ? AND resolver_version = ? AND ruleset_version = ?",
+                                      (component_type, partkeepr_id, hash, self.resolver_version,
+                                       self.ruleset_version)).fetchone()
+        if row is not None:
+            return [RuleResult.from_dict(result) for result in json.loads(row[0])]
+
+    def store(self, component_type, partkeepr_id, hash, results):
+        self.connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                                (component_type, partkeepr_id, hash, self.resolver_version, self.ruleset_version,
+                                 json.dumps([result.to_dict() for result in results])))
+
+    def prune(self, components_by_type):
+        """Remove results of parts which are no longer in the inventory"""
+        present = {(component_type, component['partkeepr_id']) for component_type, components in
+                   components_by_type.items() for component in components}
+        stored = self.connection.execute("SELECT component_type, partkeepr_id FROM results").fetchall()
+        self.connection.executemany("DELETE FROM results WHERE component_type = ? AND partkeepr_id = ?",
+                                    [key for key in stored if key not in present])
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+
+def run_incremental(validation_engine, components_by_type, cache, jobs=1, full=False):
+    """Validate only components whose content changed since the results were stored, results of the others are
+    taken from cache. Report has the same results in the same order as validation of all components.
+
+    :full: validate all components, stored results are replaced
+    """
+    hashes = {}
+    cached = {}
+    changed = {}
+    for component_type, components in components_by_type.items():
+        changed[component_type] = []
+        for index, component in enumerate(components):
+            key = (component_type, index)
+            hashes[key] = component_hash(component)
+            results = None if full else cache.get(component_type, component['partkeepr_id'], hashes[key])
+            if results is None:
+                changed[component_type].append(component)
+            else:
+                cached[key] = results
+
+    # results of validated components are grouped back per component, they are in component order
+    validated = {}
+    for result in validation_engine.run_all(changed, jobs).results:
+        validated.setdefault((result.component_type, result.partkeepr_id), []).append(result)
+
+    report = ValidationReport()
+    for component_type, components in components_by_type.items():
+        for index, component in enumerate(components):
+            key = (component_type, index)
+            if key in cached:
+                report.extend(cached[key])
+                report.cached += 1
+            else:
+                results = validated.get((component_type, component['partkeepr_id']), [])
+                cache.store(component_type, component['partkeepr_id'], hashes[key], results)
+                report.extend(results)
+                report.validated += 1
+    cache.prune(components_by_type)
+    cache.commit()
+    return report
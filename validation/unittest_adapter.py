@@ -0,0 +1,77 @@
+import decimal
+from unittest import TestCase
+
+from partkeepr_connector.skip_rules import SkipRules, print_unused
+from .engine import ValidationEngine, FAILED, SKIPPED, ERROR
+
+COMPONENT_TYPES = ['inductors', 'resistors', 'capacitors']
+
+report = None
+
+
+def open_result_cache(config, validation_engine):
+    """Returns ResultCache from [validator] results_cache location or None when it is not configured"""
+    location = config.get("validator", "results_cache", fallback="").replace('"', '')
+    if not location:
+        return None
+    from partkeepr_connector.partname_cache import resolver_version
+    from .result_cache import ResultCache, ruleset_version
+    return ResultCache(location, resolver_version(), ruleset_version(validation_engine))
+
+
+def validation_report(jobs=None, full=False, config=None):
+    """Validate whole inventory once, report is shared by all test cases run in the process
+
+    :jobs: number of validation processes, [validator] jobs config value is used when None
+    :full: validate all parts, otherwise only parts changed since the last run are validated when [validator]
+           results_cache is configured
+    :config: ConfigParser, config.ini is read when None
+    """
+    global report
+    if report is None:
+        from common import read_config, load_components
+        if config is None:
+            config = read_config()
+        components = {}
+        for component_type in COMPONENT_TYPES:
+            parse_float = decimal.Decimal if component_type == 'capacitors' else None
+            components[component_type] = load_components(config, component_type, parse_float=parse_float)
+        if jobs is None:
+            jobs = config.getint('validator', 'jobs', fallback=1)
+        validation_engine = ValidationEngine(skip_rules=SkipRules.from_config(config, 'validator',
+                                                                              'test_skip_file_location'))
+        cache = open_result_cache(config, validation_engine)
+        try:
+            report = validation_engine.run(components, jobs=jobs, cache=cache, full=full)
+        finally:
+            if cache is not None:
+                cache.close()
+        for (legacy_module, legacy_list), (module, list_name), used in validation_engine.legacy_skip_lists():
+            if used:
+                print("Skip list", legacy_module + "." + legacy_list, "is used for", list_name, "rule, copy it into",
+                      module, "skip file")
+            else:
+                print("Skip list", legacy_module + "." + legacy_list, "is ignored,", module + "." + list_name,
+                      "is used instead, remove it")
+        print_unused(validation_engine.unused_skip_entries(report))
+    return report
+
+
+class RuleTestCase(TestCase):
+    """Exposes results of validation rules of `suite` as unittest tests, one subtest per validated part"""
+    suite = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.report = validation_report()
+
+    def assert_rule(self, name=None):
+        rule_id = self.suite + '.' + (name if name is not None else self._testMethodName)
+        for result in self.report.for_rule(rule_id):
+            with self.subTest(result.label):
+                if result.status == SKIPPED:
+                    self.skipTest(result.message)
+                elif result.status == FAILED:
+                    self.fail(result.message)
+                elif result.status == ERROR:
+                    raise Exception(result.message)